@@ -0,0 +1,34 @@
+import asyncio
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+
+from backend.app.core.config import get_settings
+from backend.app.core.response_tables import response_tables
+
+router = APIRouter()
+
+
+def _authorize(token: Optional[str]) -> None:
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/templates")
+async def templates_status(x_admin_token: Optional[str] = Header(None)):
+    _authorize(x_admin_token)
+    return response_tables.status()
+
+
+@router.post("/reload-templates")
+async def reload_templates(x_admin_token: Optional[str] = Header(None)):
+    """Recompiles the template data files now. On invalid data the running tables stay in place (422)."""
+    _authorize(x_admin_token)
+    try:
+        return await asyncio.to_thread(response_tables.reload)
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Templates not reloaded: {e}")
@@ -1,7 +1,15 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple, Union
+import asyncio
+import json
+from collections import Counter
+from backend.app.core.config import get_settings
+from backend.app.core.fast_response import FastJSONResponse
 from backend.app.services.rag_service import rag_service
+from backend.app.services.triage import triage
+from backend.app.services.session_store import session_store, Session
 
 router = APIRouter()
 
@@ -10,31 +18,129 @@ class Message(BaseModel):
     content: str
 
 class ChatRequest(BaseModel):
-    messages: List[Message]
+    # Either the full history in `messages`, or session mode: `message` (the new
+    # turn only) plus the `session_id` returned by the previous response.
+    # The first session-mode request omits session_id; the server issues one.
+    messages: Optional[List[Message]] = None
     language: Optional[str] = "en"
+    session_id: Optional[str] = Field(None, max_length=64)
+    message: Optional[Message] = None
 
 class ChatResponse(BaseModel):
     response: str
     sources: Optional[List[str]] = []
     image_url: Optional[str] = None
+    alert: Optional[bool] = False
+    session_id: Optional[str] = None
+
+class TriageConversation(BaseModel):
+    id: Optional[Union[str, int]] = None
+    messages: List[Message]
+    language: Optional[str] = "en"
+
+class TriageRequest(BaseModel):
+    conversations: List[TriageConversation]
+
+def _conversation(request: ChatRequest) -> Tuple[List[dict], Optional[Session]]:
+    """Messages for the service, plus the server-side session when in session mode."""
+    if request.message is not None:
+        if not session_store.enabled:
+            raise HTTPException(status_code=501, detail="Session mode needs a single worker; send the full history in messages")
+        limit = get_settings().SESSION_MAX_MESSAGE_CHARS
+        if len(request.message.content) > limit:
+            raise HTTPException(status_code=413, detail=f"Messages are limited to {limit} characters in session mode")
+        if request.session_id:
+            session = session_store.get(request.session_id)
+            if session is None:
+                raise HTTPException(status_code=404, detail="Session not found or expired; start a new one without session_id")
+        else:
+            session = session_store.create()
+        session_store.append(session, request.message.role, request.message.content)
+        return session_store.window(session), session
+
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="No messages provided")
+    # Convert Pydantic models to list of dicts for the service
+    return [msg.dict() for msg in request.messages], None
 
 @router.post("/", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     try:
-        if not request.messages:
-             raise HTTPException(status_code=400, detail="No messages provided")
-
-        # Convert Pydantic models to list of dicts for the service
-        messages_dicts = [msg.dict() for msg in request.messages]
+        messages_dicts, session = _conversation(request)
 
-        result = await rag_service.generate_response(messages_dicts, request.language)
-        
-        return ChatResponse(
-            response=result["response"],
-            sources=result["sources"],
-            image_url=result["image_url"]
+        result = await rag_service.generate_response(
+            messages_dicts, request.language, risk_state=session.risk if session is not None else None
         )
+        if session is not None:
+            session_store.append(session, "assistant", result["response"])
+        
+        # Already in ChatResponse shape; returned directly so it is not validated
+        # and re-encoded (response_model stays for the schema)
+        return FastJSONResponse({
+            "response": result["response"],
+            "sources": result["sources"],
+            "image_url": result["image_url"],
+            "alert": result.get("alert", False),
+            "session_id": session.session_id if session is not None else None,
+        })
             
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Server-Sent Events variant of /chat. Emits "delta" events with text chunks,
+    then "sources", "alert" and "done" events (data is JSON). In session mode
+    a "session" event with the session_id comes first.
+    """
+    messages_dicts, session = _conversation(request)
+
+    async def event_stream():
+        if session is not None:
+            yield f"event: session\ndata: {json.dumps({'session_id': session.session_id})}\n\n"
+        reply = []
+        try:
+            async for event, data in rag_service.stream_response(
+                messages_dicts, request.language, risk_state=session.risk if session is not None else None
+            ):
+                if event == "delta":
+                    reply.append(data["text"])
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+            if session is not None:
+                session_store.append(session, "assistant", "".join(reply))
+        except Exception as e:
+            print(f"Error in chat stream: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/triage")
+async def chat_triage(request: TriageRequest):
+    """
+    Batch safety / intent triage: no responses are generated. Each result has
+    the risk level and template chat would use for the conversation's last
+    user message, the peak level over its user turns, and the detected
+    language and intent. Not counted in the live risk metrics.
+    """
+    limit = get_settings().TRIAGE_MAX_BATCH
+    if len(request.conversations) > limit:
+        raise HTTPException(status_code=413, detail=f"At most {limit} conversations per request")
+
+    def run() -> List[dict]:
+        results = []
+        for conversation in request.conversations:
+            result = triage([msg.dict() for msg in conversation.messages], conversation.language or "en")
+            results.append({"id": conversation.id, **result})
+        return results
+
+    # CPU-bound for large batches; keeps the event loop free
+    results = await asyncio.to_thread(run)
+    return FastJSONResponse({"results": results, "levels": Counter(result["level"] for result in results)})
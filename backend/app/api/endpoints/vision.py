@@ -1,26 +1,78 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from typing import Optional
+from backend.app.core.config import get_settings
+from backend.app.core.fast_response import FastJSONResponse
 from backend.app.services.vision_service import vision_service
+from backend.app.services.vision_stream import FrameStream
+from backend.app.services.model_scheduler import model_scheduler
 
 router = APIRouter()
 
+# Per-client rate limits and frame deduplication key on the X-Client-Id a
+# device sends (or the stream's client_id). Peer addresses are not used as a
+# fallback: many users share one address behind NAT, so anonymous requests are
+# bounded only by the scheduler's global concurrency.
+CLIENT_ID_MAX_LENGTH = 64
+
 @router.post("/analyze")
-async def analyze_image(file: UploadFile = File(...)):
+async def analyze_image(file: UploadFile = File(...),
+                        x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)):
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    result = await vision_service.analyze_image(file)
+    result = await vision_service.analyze_image(file, client_id=x_client_id or None)
     if "error" in result:
         # If API key is missing, we might want to return a mock response for testing if requested,
         # but for now we'll return the error or a 503
         if "Missing API Key" in result["error"]:
              raise HTTPException(status_code=503, detail="Vision service unconfigured")
-        raise HTTPException(status_code=500, detail=result["error"])
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
         
-    return result
+    return FastJSONResponse(result)
+
+@router.websocket("/stream")
+async def vision_stream(websocket: WebSocket, client_id: Optional[str] = Query(None, max_length=CLIENT_ID_MAX_LENGTH)):
+    """
+    Continuous vision: the client sends camera frames as binary messages and
+    receives JSON results {frame_id, latency_ms, dropped, description, ...}.
+    Frames that arrive while the model is busy are replaced by newer ones.
+    """
+    await websocket.accept()
+    client = client_id or None
+
+    async def analyze(data: bytes) -> dict:
+        return await vision_service.analyze_bytes(data, client_id=client)
+
+    async def receive() -> Optional[bytes]:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return None
+            if message.get("bytes"):
+                return message["bytes"]
+
+    stream = FrameStream(analyze, websocket.send_json, max_inflight=get_settings().VISION_STREAM_MAX_INFLIGHT)
+    try:
+        await stream.run(receive)
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/frame-cache")
+async def frame_cache_stats():
+    return FastJSONResponse(vision_service.frame_cache.stats())
+
+@router.get("/simplify-cache")
+async def simplify_cache_stats():
+    return FastJSONResponse(vision_service.simplify_cache.snapshot())
+
+@router.get("/scheduler")
+async def scheduler_stats():
+    return FastJSONResponse(model_scheduler.snapshot())
 
 @router.post("/simplify")
-async def simplify_text(text: str = Form(...)):
-    result = await vision_service.simplify_text(text)
+async def simplify_text(text: str = Form(...),
+                        x_client_id: Optional[str] = Header(None, max_length=CLIENT_ID_MAX_LENGTH)):
+    result = await vision_service.simplify_text(text, client_id=x_client_id or None)
     if "error" in result:
-        raise HTTPException(status_code=500, detail=result["error"])
-    return result
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    return FastJSONResponse(result)
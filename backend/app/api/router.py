@@ -1,7 +1,8 @@
 from fastapi import APIRouter
-from backend.app.api.endpoints import health, chat, vision
+from backend.app.api.endpoints import health, chat, vision, admin
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(vision.router, prefix="/vision", tags=["vision"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
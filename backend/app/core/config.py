@@ -1,15 +1,106 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "AarogyaMitra API"
     API_V1_STR: str = "/api/v1"
     
-    # Placeholder vector DB path
+    # Vector DB (versions published by VectorStore.publish / the ingest CLI)
     VECTOR_DB_PATH: str = "faiss_index"
+    VECTOR_INDEX_MODE: str = "flat"  # flat | fp16 | ivfpq
+    # Map the index files read-only so all workers on a host share one copy
+    VECTOR_INDEX_MMAP: bool = True
+    # How often to check for a newly published index version (0 = never)
+    VECTOR_INDEX_RELOAD_SECONDS: float = 10.0
+    EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"  # or "hashing" (offline stand-in)
+    RETRIEVAL_TOP_K: int = 3
+    # hybrid = BM25 + vector fused with reciprocal rank fusion | vector | lexical
+    RETRIEVAL_MODE: str = "hybrid"
+    RETRIEVAL_CANDIDATES: int = 20
+    RETRIEVAL_RRF_K: int = 60
+
+    # Query embedding: micro-batching window and LRU cache ("" = memory only)
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_WAIT_MS: float = 5.0
+    EMBEDDING_CACHE_SIZE: int = 4096
+    EMBEDDING_CACHE_PATH: str = ""
     
+    # Semantic response cache: paraphrases of a recent routine question (cosine
+    # similarity of query embeddings >= threshold, same language) reuse its answer.
+    # Crisis responses always bypass it. Size 0 disables.
+    SEMANTIC_CACHE_SIZE: int = 2048
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_TTL_SECONDS: float = 3600
+
+    # Extra intent/language lexicon files (comma-separated JSON paths)
+    EXTRA_LEXICON_PATHS: str = ""
+
+    # Crisis templates / canned answers ("" = bundled files in app/core/data).
+    # Reloaded when the files change, checked every N seconds (0 = admin endpoint only)
+    SAFETY_TEMPLATES_PATH: str = ""
+    RESPONSES_PATH: str = ""
+    RESPONSE_TABLES_RELOAD_SECONDS: float = 5.0
+
+    # Vision uploads: size cap, read chunk, and the bounded image sent to the model
+    VISION_MAX_UPLOAD_BYTES: int = 15 * 1024 * 1024
+    VISION_READ_CHUNK_BYTES: int = 256 * 1024
+    VISION_MAX_DIMENSION: int = 1024
+    VISION_JPEG_QUALITY: int = 85
+    VISION_PREPROCESS_WORKERS: int = 4
+
+    # Navigation frame dedup: reuse a recent description when dHash distance <= this
+    VISION_FRAME_CACHE_DISTANCE: int = 6
+    VISION_FRAME_CACHE_TTL_SECONDS: float = 3.0
+    VISION_FRAME_CACHE_FRAMES: int = 8
+    VISION_FRAME_CACHE_CLIENTS: int = 1024
+    # Frames whose dHash has fewer set bits are near-uniform and never cached
+    VISION_FRAME_CACHE_MIN_BITS: int = 8
+
+    # WebSocket continuous vision: concurrent analyses per connection
+    VISION_STREAM_MAX_INFLIGHT: int = 1
+
+    # /vision/simplify result cache ("" path = memory only)
+    SIMPLIFY_CACHE_SIZE: int = 1024
+    SIMPLIFY_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    SIMPLIFY_CACHE_PATH: str = ""
+    SIMPLIFY_CACHE_DISK_ROWS: int = 100_000
+
+    # Outbound model call scheduler (shared by vision and LLM paths)
+    MODEL_MAX_CONCURRENCY: int = 8
+    MODEL_CLIENT_RATE_PER_SECOND: float = 2.0
+    MODEL_CLIENT_BURST: float = 5.0
+    MODEL_MAX_RETRIES: int = 3
+    MODEL_BACKOFF_BASE_SECONDS: float = 0.5
+    MODEL_QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    # Server-side chat sessions (opt-in: client sends session_id + message).
+    # Held in process memory, so only available with a single worker.
+    SESSION_MAX_SESSIONS: int = 10000
+    SESSION_TTL_SECONDS: float = 1800
+    SESSION_MAX_TURNS: int = 200
+    SESSION_WINDOW_TOKENS: int = 2048
+    # Oldest turns are dropped beyond this many tokens per session
+    SESSION_MAX_TOKENS: int = 8192
+    SESSION_MAX_MESSAGE_CHARS: int = 8000
+
+    # Conversations per /chat/triage request
+    TRIAGE_MAX_BATCH: int = 1000
+
+    # Negotiated gzip/brotli for complete JSON and text responses at least this
+    # large; 0 disables compression. Brotli needs the optional `brotli` package.
+    COMPRESSION_MIN_BYTES: int = 512
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Load Gemini, the vector store and embedding model in the background at
+    # startup; /ready reports 503 until done. Off = load on first request.
+    WARMUP_ON_STARTUP: bool = False
+
     # API Keys
-    GOOGLE_API_KEY: str = None
+    GOOGLE_API_KEY: Optional[str] = None
+    # X-Admin-Token for /api/v1/admin endpoints; unset disables them
+    ADMIN_TOKEN: Optional[str] = None
 
     class Config:
         env_file = ".env"
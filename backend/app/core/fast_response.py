@@ -0,0 +1,117 @@
+# Fast JSON responses and negotiated compression
+# FastJSONResponse renders with orjson. Endpoints return it directly, so FastAPI
+# skips response_model validation and serialisation for content the services
+# already built; response_model stays on the route for the OpenAPI schema.
+#
+# CompressionMiddleware compresses complete (single body message) responses
+# above a size threshold with brotli or gzip, whichever the client accepts
+# (brotli only if the optional `brotli` package is installed). Streaming
+# responses such as SSE chat pass through untouched.
+
+import gzip
+from typing import Any, Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from backend.app.core.metrics import registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html")
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSION_BYTES = registry.counter(
+    "aarogya_http_compression_bytes", "Response body bytes before and after compression", ("encoding", "stage"))
+
+
+def _default(obj: Any):
+    # Pydantic models nested in service results
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Preferred supported encoding allowed by an Accept-Encoding header, or None."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 512, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._bytes = {(encoding, stage): COMPRESSION_BYTES.labels(encoding, stage)
+                       for encoding in ENCODINGS for stage in ("in", "out")}
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held until the first body message shows whether the response is complete
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=held["headers"])
+            media_type = headers.get("content-type", "").split(";", 1)[0].strip()
+            if (message.get("more_body") or len(body) < self.minimum_size or "content-encoding" in headers
+                    or media_type not in COMPRESSIBLE_TYPES):
+                await send(held)
+                await send(message)
+                return
+
+            compressed = self.compress(body, encoding)
+            self._bytes[(encoding, "in")].inc(len(body))
+            self._bytes[(encoding, "out")].inc(len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(held)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
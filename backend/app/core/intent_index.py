@@ -0,0 +1,109 @@
+# Inverted index for language and intent detection
+# Maps token / n-gram -> [(kind, label, weight)] so a message is tokenized once
+# and every language and intent is scored in a single pass.
+
+import json
+import os
+import string
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "intent_lexicon.json")
+
+# Punctuation becomes whitespace, then str.split(); several times faster than a
+# \w+ regex on long pastes and does not split Indic words at vowel signs.
+_SEPARATORS = str.maketrans(
+    {ch: " " for ch in string.punctuation.replace("_", "") + "\u0964\u0965\u2013\u2014\u2018\u2019\u201c\u201d\u2026\u00b0"}
+)
+
+LANGUAGE = 0
+INTENT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    return text.lower().translate(_SEPARATORS).split()
+
+
+class Detection(NamedTuple):
+    language: Optional[str]
+    intents: List[Tuple[str, float]]
+
+
+class IntentIndex:
+    """
+    Built from one or more lexicon files with the layout
+    {"languages": {label: {"priority": int, "terms": [...]}}, "intents": {...}}.
+    A term is a string (weight 1.0) or {"term": str, "weight": float}; multi-word
+    terms are matched as n-grams. Later files extend earlier ones.
+    """
+
+    def __init__(self, lexicons: Iterable[Dict]):
+        self._postings: Dict[str, List[Tuple[int, str, float]]] = {}
+        self._priority: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+        # First token of every multi-word term, so n-grams are only built where one can match
+        self._ngram_heads = set()
+        self.max_ngram = 1
+
+        for lexicon in lexicons:
+            for kind, section in ((LANGUAGE, "languages"), (INTENT, "intents")):
+                for label, spec in lexicon.get(section, {}).items():
+                    priorities = self._priority[kind]
+                    priorities[label] = spec.get("priority", priorities.get(label, len(priorities)))
+                    for term in spec.get("terms", []):
+                        self._add(kind, label, term)
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str]) -> "IntentIndex":
+        lexicons = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                lexicons.append(json.load(f))
+        return cls(lexicons)
+
+    def _add(self, kind: int, label: str, term) -> None:
+        weight = 1.0
+        if isinstance(term, dict):
+            weight = float(term.get("weight", 1.0))
+            term = term["term"]
+        tokens = tokenize(term)
+        if not tokens:
+            return
+        if len(tokens) > 1:
+            self._ngram_heads.add(tokens[0])
+            self.max_ngram = max(self.max_ngram, len(tokens))
+        self._postings.setdefault(" ".join(tokens), []).append((kind, label, weight))
+
+    def detect(self, text: str) -> Detection:
+        """
+        Scores every language and intent in one pass over the message tokens.
+        Each distinct term counts once. Ties are broken by lexicon priority.
+        """
+        tokens = tokenize(text)
+        postings = self._postings
+        # Set intersections run in C; only positions starting a known n-gram are walked
+        grams = postings.keys() & tokens
+        if self._ngram_heads and not self._ngram_heads.isdisjoint(tokens):
+            heads = self._ngram_heads
+            for i, token in enumerate(tokens):
+                if token not in heads:
+                    continue
+                gram = token
+                for n in range(2, min(self.max_ngram, len(tokens) - i) + 1):
+                    gram = gram + " " + tokens[i + n - 1]
+                    if gram in postings:
+                        grams.add(gram)
+
+        scores: Tuple[Dict[str, float], Dict[str, float]] = ({}, {})
+        for gram in grams:
+            for kind, label, weight in postings[gram]:
+                bucket = scores[kind]
+                bucket[label] = bucket.get(label, 0.0) + weight
+
+        languages = self._rank(LANGUAGE, scores[LANGUAGE])
+        return Detection(
+            language=languages[0][0] if languages else None,
+            intents=self._rank(INTENT, scores[INTENT]),
+        )
+
+    def _rank(self, kind: int, scores: Dict[str, float]) -> List[Tuple[str, float]]:
+        priority = self._priority[kind]
+        return sorted(scores.items(), key=lambda item: (-item[1], priority.get(item[0], 0)))
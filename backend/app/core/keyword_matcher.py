@@ -0,0 +1,90 @@
+# Compiled multi-pattern keyword matcher (Aho-Corasick)
+# Finds every keyword of every category in a single pass over the text,
+# only accepting hits that start and end on word boundaries.
+
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    # Combining marks (Devanagari/Bengali/Tamil vowel signs) are part of a word
+    return ch.isalnum() or ch == "_" or unicodedata.category(ch).startswith("M")
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a {category: [keywords]} mapping.
+    Category order of the mapping is the precedence order of results.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        self.categories: Tuple[str, ...] = tuple(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: tuple of (keyword_length, category_index, keyword)
+        self._out: List[Tuple[Tuple[int, int, str], ...]] = [()]
+
+        for cat_idx, category in enumerate(self.categories):
+            for keyword in keywords[category]:
+                keyword = keyword.lower().strip()
+                if keyword:
+                    self._insert(keyword, cat_idx)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, cat_idx: int) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + ((len(keyword), cat_idx, keyword),)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the suffix state so a scan never walks fail links
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """
+        Returns {category: [matched keywords]} for whole-word hits in `text`,
+        with categories in precedence order. Text is lowercased here.
+        """
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        end = len(text)
+        hits: Dict[int, List[str]] = {}
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            if i + 1 < end and _is_word_char(text[i + 1]):
+                continue
+            for length, cat_idx, keyword in out[node]:
+                start = i - length + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                hits.setdefault(cat_idx, []).append(keyword)
+        return {self.categories[idx]: hits[idx] for idx in sorted(hits)}
+
+    def categories_in(self, text: str) -> Tuple[str, ...]:
+        """Precedence-ordered tuple of categories with at least one hit."""
+        return tuple(self.find(text))
@@ -0,0 +1,229 @@
+# In-process metrics with Prometheus text exposition
+# Histograms and counters are plain Python objects updated from the event
+# loop; a labelled child is resolved once (at import or first use) so the hot
+# path is a bisect plus three additions. Components that already keep their
+# own counters (caches, scheduler) register collectors that are read only
+# when /metrics is scraped.
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Seconds; covers sub-millisecond keyword scans up to multi-second model calls
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "Timer":
+        return Timer(self)
+
+
+class Timer:
+    """Context manager that observes the elapsed seconds of its body."""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        # Text format 0.0.4 names counters by their sample name (..._total)
+        header = self.name + "_total" if self.kind == "counter" else self.name
+        lines = [f"# HELP {header} {self.documentation}", f"# TYPE {header} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: LabelValues, child) -> List[str]:
+        raise NotImplementedError
+
+
+class HistogramFamily(_Family):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> Histogram:
+        return Histogram(self.buckets)
+
+    def _render_child(self, values: LabelValues, child: Histogram) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {child.sum}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {child.count}")
+        return lines
+
+
+class CounterFamily(_Family):
+    kind = "counter"
+
+    def _new_child(self) -> Counter:
+        return Counter()
+
+    def _render_child(self, values: LabelValues, child: Counter) -> List[str]:
+        return [f"{self.name}_total{_labels(self.labelnames, values)} {child.value}"]
+
+
+class Registry:
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        # name -> callable returning {label_values: value}, read at scrape time
+        self._collectors: Dict[str, Tuple[str, str, Tuple[str, ...], Callable[[], Dict[LabelValues, float]]]] = {}
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> HistogramFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = HistogramFamily(name, documentation, labelnames, buckets)
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> CounterFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = CounterFamily(name, documentation, labelnames)
+        return family
+
+    def register_collector(self, name: str, kind: str, documentation: str, labelnames: Iterable[str],
+                           collect: Callable[[], Dict[LabelValues, float]]) -> None:
+        """`collect()` is called on every scrape; `kind` is "counter" or "gauge"."""
+        self._collectors[name] = (kind, documentation, tuple(labelnames), collect)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        for name, (kind, documentation, labelnames, collect) in self._collectors.items():
+            try:
+                samples = collect()
+            except Exception as e:
+                print(f"Metrics collector {name} failed: {e}")
+                continue
+            sample = name + "_total" if kind == "counter" else name
+            lines.append(f"# HELP {sample} {documentation}")
+            lines.append(f"# TYPE {sample} {kind}")
+            for values, value in sorted(samples.items()):
+                lines.append(f"{sample}{_labels(labelnames, values)} {float(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "aarogya_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+CHAT_STAGE_SECONDS = registry.histogram(
+    "aarogya_chat_stage_seconds", "Chat pipeline latency by stage", ("stage",))
+VISION_STAGE_SECONDS = registry.histogram(
+    "aarogya_vision_stage_seconds", "Vision pipeline latency by stage", ("stage",))
+RISK_ASSESSMENTS = registry.counter(
+    "aarogya_risk_assessments", "Chat messages by assessed risk level and safety template", ("level", "template"))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route HTTP latency. The route label is the
+    path of the matched route with path parameters put back as {name}, and
+    "unmatched" for 404s, so label cardinality stays bounded. Streaming
+    responses are timed to their last byte.
+    """
+
+    def __init__(self, app, histogram: HistogramFamily = REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.labels(scope["method"], _route_label(scope), str(status)).observe(
+                time.perf_counter() - start)
+
+
+def _route_label(scope) -> str:
+    if scope.get("route") is None:
+        return "unmatched"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
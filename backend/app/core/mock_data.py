@@ -6,21 +6,4 @@ HEALTH_IMAGES = {
     "default": "https://images.unsplash.com/photo-1576091160399-112ba8d25d1d?w=800&auto=format&fit=crop&q=60" # Doctor/Medical generic
 }
 
-# Mock multilingual responses
-MULTILINGUAL_RESPONSES = {
-    "hi": {
-        "greeting": "नमस्ते! मैं आरोग्यमित्र हूँ। मैं आपकी कैसे सहायता कर सकता हूँ?",
-        "disclaimer": "अस्वीकरण: मैं एक एआई हूँ, डॉक्टर नहीं।",
-        "default": "मुझे खेद है, मुझे अभी सर्वर से कनेक्ट करने में समस्या हो रही है."
-    },
-    "es": {
-        "greeting": "¡Hola! Soy AarogyaMitra. ¿Cómo puedo ayudarte hoy?",
-        "disclaimer": "Descargo de responsabilidad: Soy una IA, no un médico.",
-        "default": "Lo siento, tengo problemas para conectarme al servidor."
-    },
-    "fr": {
-        "greeting": "Bonjour! Je suis AarogyaMitra. Comment puis-je vous aider?",
-        "disclaimer": "Avis de non-responsabilité: Je suis une IA, pas un médecin.",
-        "default": "Désolé, j'ai du mal à me connecter au serveur."
-    }
-}
+# Multilingual greeting / disclaimer strings are in data/responses.json ("messages")
@@ -0,0 +1,235 @@
+# Crisis templates and canned chat answers, compiled from versioned data files
+# (data/safety_templates.json, data/responses.json) into immutable lookup tables.
+# Every (template, helpline locale) crisis message and every variant of every
+# (intent, language) answer is rendered once at load time, so the request path
+# is a dict lookup.
+#
+# A reload (data file changed, or POST /api/v1/admin/reload-templates) compiles
+# a new ResponseTables and swaps it in with one reference assignment. Requests
+# read `response_tables.current` once and never take a lock. Files that fail
+# validation leave the previous tables in place.
+
+import asyncio
+import itertools
+import json
+import os
+import string
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.app.core.config import get_settings
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_SAFETY_PATH = os.path.join(DATA_DIR, "safety_templates.json")
+DEFAULT_RESPONSES_PATH = os.path.join(DATA_DIR, "responses.json")
+
+# Selected by the risk logic (rag_service._assess_risk, risk_state.RiskState)
+REQUIRED_TEMPLATES = ("T001", "T002", "T003", "T004", "T005", "T006", "T007")
+
+DEFAULT_INTENT = "default"
+DEFAULT_LANGUAGE = "en"
+
+# Placeholders a response template may use; "intro" and "technique" expand to one variant per value
+RESPONSE_FIELDS = ("intro", "technique", "techniques")
+
+_FORMATTER = string.Formatter()
+
+
+def _fields(template: str) -> set:
+    """Top-level placeholder names of a str.format template."""
+    return {field.split("[", 1)[0].split(".", 1)[0] for _, field, _, _ in _FORMATTER.parse(template) if field}
+
+
+class ResponseTables:
+    """Lookup tables built by compile_tables(). Never mutated; a reload builds a new instance."""
+
+    def __init__(self, version: Dict[str, int], safety: Dict[Tuple[str, str], str],
+                 helpline_locales: dict, safety_sources: Tuple[str, ...],
+                 responses: Dict[Tuple[str, str], Tuple[str, ...]], messages: Dict[Tuple[str, str], str]):
+        self.version = MappingProxyType(version)
+        self.safety = MappingProxyType(safety)
+        self.safety_sources = safety_sources
+        self._default_locale = helpline_locales["default"]
+        self._language_locales = MappingProxyType(dict(helpline_locales.get("languages", {})))
+        self._mention_locales = tuple(helpline_locales.get("mentions", {}).items())
+        self.responses = MappingProxyType(responses)
+        self.intents = frozenset(intent for intent, _ in responses)
+        self.messages = MappingProxyType(messages)
+
+    def helpline_locale(self, language: str, text: str) -> str:
+        """Helplines follow the request language, then a place named in the (lowercased) message."""
+        locale = self._language_locales.get(language)
+        if locale is not None:
+            return locale
+        for mention, locale in self._mention_locales:
+            if mention in text:
+                return locale
+        return self._default_locale
+
+    def safety_text(self, template_id: str, language: str, text: str) -> str:
+        """Crisis template followed by the local helpline block."""
+        return self.safety[(template_id, self.helpline_locale(language, text))]
+
+    def response_variants(self, intent: Optional[str], language: str) -> Tuple[str, ...]:
+        """Prerendered answers for the intent (generic answer if unknown), in `language` or English."""
+        if intent not in self.intents:
+            intent = DEFAULT_INTENT
+        return self.responses.get((intent, language)) or self.responses[(intent, DEFAULT_LANGUAGE)]
+
+
+def compile_tables(safety: dict, responses: dict) -> ResponseTables:
+    """Validates the two data files and renders every response. Raises ValueError on bad data."""
+    templates = safety.get("templates", {})
+    missing = [tid for tid in REQUIRED_TEMPLATES if not isinstance(templates.get(tid, {}).get("text"), str)]
+    if missing:
+        raise ValueError(f"safety templates missing text for {', '.join(missing)}")
+
+    helplines = safety.get("helplines", {})
+    locales = safety.get("helpline_locales", {})
+    targets = [locales.get("default")] + list(locales.get("languages", {}).values()) + \
+        list(locales.get("mentions", {}).values())
+    unknown = sorted({str(locale) for locale in targets if locale not in helplines})
+    if unknown:
+        raise ValueError(f"helpline_locales refers to unknown helpline locales: {', '.join(unknown)}")
+
+    header, line = safety.get("helpline_header", ""), safety.get("helpline_line", "- {name}: {number}\n")
+    rendered_safety = {}
+    for locale, numbers in helplines.items():
+        block = header + "".join(line.format(name=name, number=number) for name, number in numbers.items())
+        for tid, template in templates.items():
+            rendered_safety[(tid, locale)] = template["text"] + block
+
+    intros = responses.get("intros", {})
+    techniques = {}
+    for key, technique in responses.get("techniques", {}).items():
+        steps = technique.get("key_concepts") or technique.get("methods")
+        if not steps:
+            raise ValueError(f"technique '{key}' needs key_concepts or methods")
+        techniques[key] = {**technique, "first_step": steps[0]}
+
+    answers = responses.get("responses", {})
+    if DEFAULT_LANGUAGE not in answers.get(DEFAULT_INTENT, {}):
+        raise ValueError(f"responses.{DEFAULT_INTENT} needs an '{DEFAULT_LANGUAGE}' answer")
+    rendered: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+    for intent, by_language in answers.items():
+        if DEFAULT_LANGUAGE not in by_language:
+            raise ValueError(f"responses.{intent} needs an '{DEFAULT_LANGUAGE}' answer")
+        for language, template in by_language.items():
+            rendered[(intent, language)] = _render(template, f"responses.{intent}.{language}",
+                                                   intros.get(language), techniques)
+
+    messages = {(key, language): text
+                for language, by_key in responses.get("messages", {}).items() for key, text in by_key.items()}
+    version = {"safety": safety.get("version"), "responses": responses.get("version")}
+    return ResponseTables(version, rendered_safety, locales, tuple(safety.get("sources", ())), rendered, messages)
+
+
+def _render(template: str, where: str, intros: Optional[List[str]], techniques: Dict[str, dict]) -> Tuple[str, ...]:
+    try:
+        fields = _fields(template)
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+    unknown = fields.difference(RESPONSE_FIELDS)
+    if unknown:
+        raise ValueError(f"{where}: unknown placeholder(s) {', '.join(sorted(unknown))}")
+    if "intro" in fields and not intros:
+        raise ValueError(f"{where}: uses {{intro}} but there are no intros for this language")
+    if "technique" in fields and not techniques:
+        raise ValueError(f"{where}: uses {{technique}} but no techniques are defined")
+
+    # One variant per combination, so random.choice keeps the old uniform choice of each part
+    variants = []
+    for intro, technique in itertools.product(intros if "intro" in fields else [None],
+                                              list(techniques.values()) if "technique" in fields else [None]):
+        try:
+            variants.append(template.format(intro=intro, technique=technique, techniques=techniques))
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"{where}: {e!r}") from None
+    return tuple(variants)
+
+
+class ResponseTableStore:
+    def __init__(self, safety_path: str, responses_path: str):
+        self.paths = (safety_path, responses_path)
+        # Serialises reloads only; readers use `current` without locking
+        self._lock = threading.Lock()
+        self._mtimes = self._stat()
+        self.current = self._compile()
+        self.loaded_at = time.time()
+        self.reloads = {"ok": 0, "error": 0}
+        self.last_error: Optional[str] = None
+        self._listeners: List[Callable[[ResponseTables], None]] = []
+
+    def _stat(self) -> Tuple[int, ...]:
+        return tuple(os.stat(path).st_mtime_ns for path in self.paths)
+
+    def _compile(self) -> ResponseTables:
+        data = []
+        for path in self.paths:
+            with open(path, encoding="utf-8") as f:
+                data.append(json.load(f))
+        try:
+            return compile_tables(*data)
+        except (AttributeError, KeyError, TypeError) as e:
+            # Wrong shape somewhere (e.g. a list where an object belongs)
+            raise ValueError(f"malformed data file: {e!r}") from None
+
+    def on_reload(self, listener: Callable[[ResponseTables], None]) -> None:
+        """`listener(tables)` runs after every successful reload (e.g. to drop cached answers)."""
+        self._listeners.append(listener)
+
+    def reload(self) -> dict:
+        """Recompiles the data files and swaps them in. Raises ValueError / OSError and keeps the old tables on failure."""
+        with self._lock:
+            try:
+                # Recorded even if compiling fails, so the watcher does not retry unchanged files
+                self._mtimes = self._stat()
+                tables = self._compile()
+            except (OSError, ValueError) as e:
+                self.reloads["error"] += 1
+                self.last_error = str(e)
+                print(f"Response tables reload failed, keeping version {dict(self.current.version)}: {e}")
+                raise
+            self.current = tables
+            self.loaded_at = time.time()
+            self.reloads["ok"] += 1
+            self.last_error = None
+        for listener in self._listeners:
+            listener(tables)
+        return self.status()
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtimes = self._stat()
+        except OSError:
+            return False
+        if mtimes == self._mtimes:
+            return False
+        try:
+            self.reload()
+        except (OSError, ValueError):
+            pass
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Polls the data files for changes until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def status(self) -> dict:
+        return {
+            "version": dict(self.current.version),
+            "paths": list(self.paths),
+            "loaded_at": self.loaded_at,
+            "reloads": dict(self.reloads),
+            "last_error": self.last_error,
+        }
+
+
+response_tables = ResponseTableStore(
+    get_settings().SAFETY_TEMPLATES_PATH or DEFAULT_SAFETY_PATH,
+    get_settings().RESPONSES_PATH or DEFAULT_RESPONSES_PATH,
+)
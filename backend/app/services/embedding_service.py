@@ -0,0 +1,137 @@
+# Async query embedding with micro-batching and an LRU cache
+# Concurrent embed() calls are collected for a few milliseconds and encoded
+# as one batch in a worker thread, so the model never runs on the event loop.
+# Results are cached by normalised-text hash, optionally persisted to disk
+# together with the embedder name and dimension they were computed with.
+
+import asyncio
+import atexit
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class EmbeddingService:
+    def __init__(self, embedder, max_batch: int = 32, max_wait_ms: float = 5.0,
+                 cache_size: int = 4096, cache_path: Optional[str] = None):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Keys already queued or being encoded -> shared future
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "batches": 0, "batched_texts": 0}
+
+        if cache_path:
+            self._load_cache()
+            atexit.register(self.save)
+
+    async def embed(self, text: str) -> np.ndarray:
+        normalized = normalize_query(text)
+        key = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return vector
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._ensure_worker()
+            self._queue.put_nowait((key, normalized, future))
+        return await asyncio.shield(future)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[str, str, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for _, text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(None, self.embedder.encode, texts)
+            except Exception as e:
+                for key, _, future in batch:
+                    self._inflight.pop(key, None)
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["batched_texts"] += len(batch)
+            for (key, _, future), vector in zip(batch, vectors):
+                self._put(key, vector)
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_result(vector)
+
+    def _put(self, key: str, vector: np.ndarray) -> None:
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _load_cache(self) -> None:
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with np.load(self.cache_path) as data:
+                model = str(data["model"]) if "model" in data else None
+                dim = data["vectors"].shape[1] if data["vectors"].ndim == 2 else None
+                # Only checked when known without loading the model; the name pins it otherwise
+                expected_dim = vars(self.embedder).get("dim")
+                if model != self.embedder.name or (expected_dim is not None and dim != expected_dim):
+                    print(f"Warning: embedding cache {self.cache_path} was built with {model} ({dim}d), "
+                          f"not {self.embedder.name} ({expected_dim or '?'}d); ignoring it")
+                    return
+                for key, vector in zip(data["keys"].tolist(), data["vectors"]):
+                    self._put(key, vector)
+        except Exception as e:
+            print(f"Warning: could not load embedding cache {self.cache_path}: {e}")
+
+    def save(self) -> None:
+        """Writes the cache to `cache_path` (atomic replace), oldest entries first."""
+        if not self.cache_path or not self._cache:
+            return
+        # Per-process temporary file: every worker saves at exit
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".embedding-cache-", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, keys=np.array(list(self._cache)), vectors=np.stack(list(self._cache.values())),
+                         model=np.array(self.embedder.name))
+            os.replace(tmp, self.cache_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -0,0 +1,78 @@
+# Text embedders for retrieval
+# Both expose encode(texts) -> float32 array of L2-normalised rows, so the
+# vector store can use inner product as cosine similarity.
+
+import hashlib
+from typing import List
+
+import numpy as np
+
+from backend.app.core.intent_index import tokenize
+
+HASHING_EMBEDDER = "hashing"
+
+
+class HashingEmbedder:
+    """
+    Deterministic, offline stand-in for sentence-transformers: signed feature
+    hashing of tokens and character trigrams. No model download, same output
+    on every machine, so it is usable in tests and benchmarks.
+    """
+
+    name = HASHING_EMBEDDER
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        for token in tokenize(text):
+            features.append(token)
+            padded = f"#{token}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                out[row, digest % self.dim] += 1.0 if (digest >> 63) else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+class SentenceTransformerEmbedder:
+    """Wraps a sentence-transformers model; the model is loaded on first encode()."""
+
+    def __init__(self, model_name: str):
+        self.name = model_name
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.name)
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        vectors = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def get_embedder(model_name: str):
+    if model_name == HASHING_EMBEDDER:
+        return HashingEmbedder()
+    return SentenceTransformerEmbedder(model_name)
@@ -0,0 +1,87 @@
+# Per-client cache of recent navigation frames keyed by perceptual hash
+# Consecutive camera frames are often near-identical; when a new frame's
+# dHash is within `max_distance` bits of a recent frame from the same
+# client, the earlier description is reused instead of calling the model.
+# Near-uniform frames (dark rooms, a covered lens, a blank wall) hash to
+# almost all zero bits whatever they show, so they are never cached.
+
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Deque, Optional, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+def dhash(image: "Image.Image", size: int = 8) -> int:
+    """64-bit difference hash: compares horizontally adjacent pixels of a 9x8 greyscale thumbnail."""
+    from PIL import Image
+
+    pixels = list(image.convert("L").resize((size + 1, size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class FrameCache:
+    def __init__(self, max_distance: int = 6, ttl_seconds: float = 3.0,
+                 frames_per_client: int = 8, max_clients: int = 1024, min_bits: int = 8):
+        self.max_distance = max_distance
+        self.min_bits = min_bits
+        self.ttl = ttl_seconds
+        self.frames_per_client = frames_per_client
+        self.max_clients = max_clients
+        # client_id -> recent (hash, description, stored_at), newest last; clients in LRU order
+        self._clients: "OrderedDict[str, Deque[Tuple[int, str, float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.uniform = 0
+
+    def cacheable(self, frame_hash: int) -> bool:
+        """False for near-uniform frames, whose hashes carry too little detail to compare."""
+        return bin(frame_hash).count("1") >= self.min_bits
+
+    def lookup(self, client_id: str, frame_hash: int) -> Optional[str]:
+        if not self.cacheable(frame_hash):
+            self.uniform += 1
+            return None
+        frames = self._clients.get(client_id)
+        if frames is not None:
+            self._clients.move_to_end(client_id)
+            cutoff = time.monotonic() - self.ttl
+            while frames and frames[0][2] < cutoff:
+                frames.popleft()
+            for cached_hash, description, _ in reversed(frames):
+                if hamming(cached_hash, frame_hash) <= self.max_distance:
+                    self.hits += 1
+                    return description
+        self.misses += 1
+        return None
+
+    def store(self, client_id: str, frame_hash: int, description: str) -> None:
+        if not self.cacheable(frame_hash):
+            return
+        frames = self._clients.get(client_id)
+        if frames is None:
+            frames = self._clients[client_id] = deque(maxlen=self.frames_per_client)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        self._clients.move_to_end(client_id)
+        frames.append((frame_hash, description, time.monotonic()))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "uniform": self.uniform,
+            "clients": len(self._clients),
+        }
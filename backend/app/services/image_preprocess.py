@@ -0,0 +1,77 @@
+# Upload reading and image preprocessing for the vision model
+# Uploads are read in bounded chunks. Decoding, downscaling and re-encoding
+# are CPU-bound PIL work that callers run in a thread pool, off the event loop.
+# PIL is imported on first use so that importing the API stays cheap.
+
+import io
+import time
+from typing import NamedTuple, Tuple
+
+from fastapi import UploadFile
+
+from backend.app.services.frame_cache import dhash
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class PreparedImage(NamedTuple):
+    data: bytes               # JPEG bytes sent to the model
+    size: Tuple[int, int]     # size after downscaling
+    original_size: Tuple[int, int]
+    frame_hash: int           # perceptual dHash of the downscaled frame
+    decode_ms: float
+    encode_ms: float
+
+
+async def read_upload(file: UploadFile, max_bytes: int, chunk_size: int = 256 * 1024) -> bytes:
+    """
+    Reads the upload chunk by chunk, failing as soon as it exceeds `max_bytes`.
+    An upload whose declared size is already over the limit is rejected unread.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"Image exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        if len(buffer) + len(chunk) > max_bytes:
+            raise UploadTooLarge(f"Image exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def prepare_image(data: bytes, max_dimension: int = 1024, quality: int = 85) -> PreparedImage:
+    """
+    Decodes, orients and downscales the image so its longest side is at most
+    `max_dimension`, then re-encodes it as JPEG. For JPEG input, draft mode lets
+    the decoder skip straight to a reduced DCT scale instead of decoding full size.
+    """
+    from PIL import Image, ImageOps
+
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(data))
+    original_size = image.size
+    if image.format == "JPEG":
+        image.draft("RGB", (max_dimension, max_dimension))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.thumbnail((max_dimension, max_dimension))
+    frame_hash = dhash(image)
+    decoded = time.perf_counter()
+
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=quality, optimize=True)
+    encoded = time.perf_counter()
+
+    return PreparedImage(
+        data=out.getvalue(),
+        size=image.size,
+        original_size=original_size,
+        frame_hash=frame_hash,
+        decode_ms=(decoded - start) * 1e3,
+        encode_ms=(encoded - decoded) * 1e3,
+    )
@@ -0,0 +1,275 @@
+# Document ingestion into the vector store
+# Streams pages out of PDFs / text files, chunks them with overlap, parses
+# page ranges in a process pool, embeds in batches and appends to the existing
+# index. A content-hash manifest lets re-runs skip unchanged files and drop
+# the chunks of files that were deleted.
+# Each run that changes the index publishes it as a new version, so running
+# servers pick it up without ever reading a partially written index.
+#
+# Usage (from the repository root):
+#   python -m backend.app.services.ingest docs/who/ protocols.pdf --workers 4
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.app.core.config import get_settings
+
+MANIFEST_FILE = "manifest.json"
+SUPPORTED_EXTENSIONS = (".pdf", ".txt", ".md")
+
+# Text files are streamed in blocks of roughly this many characters
+TEXT_BLOCK_CHARS = 64 * 1024
+
+# Work unit per worker task, so one large file never comes back as a single
+# pickled list. Chunks do not span task boundaries.
+PDF_PAGES_PER_TASK = 16
+TEXT_BYTES_PER_TASK = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_pages(path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Optional[int], str]]:
+    """
+    Yields (page_number, text). Page numbers are 1-based for PDFs and None for
+    text files. [start, stop) is a range of 0-based pages for PDFs and of bytes
+    for text files, where a line belongs to the range holding its first byte.
+    """
+    if path.lower().endswith(".pdf"):
+        from pypdf import PdfReader
+
+        reader = PdfReader(path)
+        stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+        for index in range(start, stop):
+            yield index + 1, reader.pages[index].extract_text() or ""
+        return
+
+    with open(path, "rb") as f:
+        if start:
+            # Skip the line that began in the previous range
+            f.seek(start - 1)
+            f.readline()
+        block: List[str] = []
+        size = 0
+        while stop is None or f.tell() < stop:
+            line = f.readline()
+            if not line:
+                break
+            block.append(line.decode("utf-8", errors="replace"))
+            size += len(block[-1])
+            if size >= TEXT_BLOCK_CHARS:
+                yield None, "".join(block)
+                block, size = [], 0
+        if block:
+            yield None, "".join(block)
+
+
+def plan_tasks(path: str) -> List[Tuple[str, int, int]]:
+    """Splits a file into (path, start, stop) ranges for iter_pages."""
+    if path.lower().endswith(".pdf"):
+        from pypdf import PdfReader
+
+        total, step = len(PdfReader(path).pages), PDF_PAGES_PER_TASK
+    else:
+        total, step = os.path.getsize(path), TEXT_BYTES_PER_TASK
+    return [(path, start, min(start + step, total)) for start in range(0, total, step)] or [(path, 0, 0)]
+
+
+def chunk_pages(pages: Iterator[Tuple[Optional[int], str]], source: str,
+                chunk_size: int = 800, overlap: int = 150) -> Iterator[dict]:
+    """
+    Word-aligned sliding window over the page stream. Each chunk is about
+    `chunk_size` characters and repeats the last `overlap` characters of the
+    previous one. Chunks may span page boundaries.
+    """
+    window: List[Tuple[str, Optional[int]]] = []
+    length = 0
+    fresh = 0  # words added since the last emitted chunk
+
+    def emit():
+        page = window[0][1]
+        label = f"{source} p.{page}" if page is not None else source
+        return {"text": " ".join(word for word, _ in window), "source": label}
+
+    for page, text in pages:
+        for word in text.split():
+            window.append((word, page))
+            length += len(word) + 1
+            fresh += 1
+            if length >= chunk_size:
+                yield emit()
+                kept: List[Tuple[str, Optional[int]]] = []
+                kept_length = 0
+                for item in reversed(window):
+                    if kept_length >= overlap:
+                        break
+                    kept.append(item)
+                    kept_length += len(item[0]) + 1
+                window = kept[::-1]
+                length = kept_length
+                fresh = 0
+    if fresh:
+        yield emit()
+
+
+def parse_range(task: Tuple[str, int, int], chunk_size: int, overlap: int) -> Tuple[str, List[dict]]:
+    """Process-pool worker: returns (path, chunks) for one range of a file."""
+    path, start, stop = task
+    source = os.path.basename(path)
+    return path, list(chunk_pages(iter_pages(path, start, stop), source, chunk_size, overlap))
+
+
+def _parsed(tasks: List[Tuple[str, int, int]], workers: Optional[int],
+            chunk_size: int, overlap: int) -> Iterator[Tuple[str, List[dict]]]:
+    """Task results in order, with at most 2 x workers tasks in flight."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+        for task in tasks:
+            inflight.append(pool.submit(parse_range, task, chunk_size, overlap))
+            if len(inflight) >= 2 * workers:
+                yield inflight.popleft().result()
+        while inflight:
+            yield inflight.popleft().result()
+
+
+def discover(paths: List[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS)
+                )
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            print(f"Warning: {path} does not exist, skipping")
+    return [os.path.abspath(p) for p in found]
+
+
+def load_manifest(index_path: str) -> Dict[str, dict]:
+    path = os.path.join(index_path, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(index_path: str, manifest: Dict[str, dict]) -> None:
+    os.makedirs(index_path, exist_ok=True)
+    tmp = os.path.join(index_path, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(index_path, MANIFEST_FILE))
+
+
+def ingest(paths: List[str], index_path: str, mode: str = "flat", embedding_model: Optional[str] = None,
+           workers: Optional[int] = None, batch_size: int = 64,
+           chunk_size: int = 800, overlap: int = 150) -> dict:
+    """Appends new or changed files under `paths` to the index at `index_path`. Returns run stats."""
+    from backend.app.services.embeddings import get_embedder
+    from backend.app.services.vector_store import VectorStore, MIN_IVFPQ_TRAINING
+
+    settings = get_settings()
+    embedder = get_embedder(embedding_model or settings.EMBEDDING_MODEL)
+    if VectorStore.exists(index_path):
+        store = VectorStore.load(index_path, embedder)
+    else:
+        store = VectorStore(embedder, mode=mode)
+    manifest = load_manifest(index_path)
+
+    stats = {"files_seen": 0, "files_skipped": 0, "files_indexed": 0, "files_removed": 0, "chunks": 0}
+    started = time.perf_counter()
+
+    # Files that were deleted since the last run
+    for path in [path for path in manifest if not os.path.exists(path)]:
+        store.remove(manifest.pop(path)["ids"])
+        stats["files_removed"] += 1
+
+    todo: Dict[str, str] = {}
+    for path in discover(paths):
+        stats["files_seen"] += 1
+        sha = file_sha256(path)
+        entry = manifest.get(path)
+        if entry and entry["sha256"] == sha:
+            stats["files_skipped"] += 1
+            continue
+        todo[path] = sha
+
+    # Chunks waiting to be embedded, with the file each one belongs to
+    pending: List[Tuple[str, dict]] = []
+    new_ids: Dict[str, List[int]] = {}
+
+    def flush(final: bool = False) -> None:
+        nonlocal pending
+        # An untrained ivfpq index needs enough vectors for its codebooks
+        if store.index is None and not final and len(pending) < MIN_IVFPQ_TRAINING:
+            return
+        while pending and (final or len(pending) >= batch_size):
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            if store.index is None:
+                batch, pending = batch + pending, []
+            ids = store.add([chunk for _, chunk in batch])
+            for (path, _), pid in zip(batch, ids):
+                new_ids.setdefault(path, []).append(pid)
+
+    # Changed files: drop their previous chunks before appending the new ones
+    for path in todo:
+        if path in manifest:
+            store.remove(manifest[path]["ids"])
+
+    tasks = [task for path in todo for task in plan_tasks(path)]
+    for path, chunks in _parsed(tasks, workers, chunk_size, overlap):
+        pending.extend((path, chunk) for chunk in chunks)
+        stats["chunks"] += len(chunks)
+        flush()
+    flush(final=True)
+    stats["files_indexed"] = len(todo)
+
+    for path, sha in todo.items():
+        manifest[path] = {"sha256": sha, "ids": new_ids.get(path, [])}
+
+    if todo or stats["files_removed"]:
+        stats["version"] = store.publish(index_path)
+        save_manifest(index_path, manifest)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["index_size"] = len(store)
+    return stats
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Ingest PDFs and text files into the AarogyaMitra vector index.")
+    parser.add_argument("paths", nargs="+", help="Files or directories to ingest")
+    parser.add_argument("--index-path", default=settings.VECTOR_DB_PATH)
+    parser.add_argument("--mode", default=settings.VECTOR_INDEX_MODE, help="Index mode for a new index: flat | fp16 | ivfpq")
+    parser.add_argument("--embedding-model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--overlap", type=int, default=150)
+    args = parser.parse_args()
+
+    stats = ingest(
+        args.paths, args.index_path, mode=args.mode, embedding_model=args.embedding_model,
+        workers=args.workers, batch_size=args.batch_size,
+        chunk_size=args.chunk_size, overlap=args.overlap,
+    )
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# BM25 lexical index over the vector store's passages
+# Dense embeddings handle romanised Hindi / Marathi / Bengali / Tamil poorly
+# ("bukhaar", "jvar", "sir dard"), so retrieval also ranks passages lexically
+# and fuses both rankings with reciprocal rank fusion.
+#
+# Postings are CSR-style numpy arrays: the passages containing term t are
+# docs[offsets[t]:offsets[t + 1]], with term frequencies in tfs. Additions and
+# removals are buffered and merged into the arrays by compact(), which save()
+# and VectorStore.load() call. search() only reads the merged arrays, so it
+# can run in several threads at once.
+# On disk (VECTOR_DB_PATH/lexical/): one .npy per array, the vocabulary as
+# byte-sorted UTF-8 terms in vocab.bin (vocab_offsets.npy / vocab_ids.npy),
+# and vocab.json with the BM25 parameters. load(mmap=True) maps all of it
+# read-only, so every worker process shares one copy through the page cache.
+
+import json
+import mmap
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.app.core.intent_index import tokenize
+
+LEXICAL_DIR = "lexical"
+ARRAYS = ("offsets", "docs", "tfs", "doc_ids", "doc_len")
+VOCAB_ARRAYS = ("vocab_offsets", "vocab_ids")
+
+# Spelling variants of romanised Indic words, applied in order after accents are stripped:
+# bukhaar/bukhar, jwar/jvar, sheet/shit -> sit, phal/fal, zukam/jukam, qabz/kabz
+_REWRITES = (("ph", "f"), ("sh", "s"), ("w", "v"), ("z", "j"), ("q", "k"), ("ck", "k"),
+             ("ee", "i"), ("oo", "u"), ("ou", "u"))
+_REPEATS = re.compile(r"(.)\1+")
+
+
+@lru_cache(maxsize=65536)
+def normalize_token(token: str) -> str:
+    """
+    Folds transliteration variants of a token onto one form. Tokens in Indic
+    scripts are only NFC-normalised; their vowel signs are part of the word.
+    """
+    stripped = "".join(ch for ch in unicodedata.normalize("NFKD", token) if not unicodedata.combining(ch))
+    if not stripped.isascii():
+        return unicodedata.normalize("NFC", token)
+    for old, new in _REWRITES:
+        stripped = stripped.replace(old, new)
+    stripped = _REPEATS.sub(r"\1", stripped)
+    # Light plural folding: headaches -> headache
+    if len(stripped) > 4 and stripped.endswith("s"):
+        stripped = stripped[:-1]
+    return stripped
+
+
+def analyze(text: str) -> List[str]:
+    return [normalize_token(token) for token in tokenize(text)]
+
+
+def map_file(path: str):
+    """Read-only shared mapping of a file; slices are bytes. Empty files cannot be mapped."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuses ranked id lists: score(id) = sum of 1 / (k + rank), rank starting at 1."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, pid in enumerate(ranking, start=1):
+            scores[pid] = scores.get(pid, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class MappedVocab(Mapping):
+    """
+    Read-only term -> term id table over byte-sorted UTF-8 terms, looked up by
+    binary search. Replaces a per-process dict when the index is memory-mapped.
+    """
+
+    def __init__(self, blob, offsets: np.ndarray, ids: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+        self._ids = ids
+
+    def _term(self, i: int) -> bytes:
+        return self._blob[int(self._offsets[i]):int(self._offsets[i + 1])]
+
+    def __getitem__(self, term: str) -> int:
+        key = term.encode("utf-8")
+        lo, hi = 0, len(self._ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(self._ids) or self._term(lo) != key:
+            raise KeyError(term)
+        return int(self._ids[lo])
+
+    def __iter__(self):
+        return (self._term(i).decode("utf-8") for i in range(len(self._ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class LexicalIndex:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.docs = np.zeros(0, dtype=np.int32)       # slot of each posting
+        self.tfs = np.zeros(0, dtype=np.uint16)
+        self.doc_ids = np.zeros(0, dtype=np.int64)    # slot -> passage id
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        # passage id -> slot, built on the first remove()
+        self._slots: Optional[Dict[int, int]] = None
+        # Not yet merged into the arrays
+        self._pending: Dict[int, Counter] = {}
+        self._removed: set = set()
+        self._avgdl = None
+        self._compact_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_ids) - len(self._removed) + len(self._pending)
+
+    def add(self, ids: Iterable[int], texts: Iterable[str]) -> None:
+        for pid, text in zip(ids, texts):
+            counts = Counter()
+            for term in analyze(text):
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    term_id = self.vocab[term] = len(self.vocab)
+                counts[term_id] += 1
+            self._pending[pid] = counts
+
+    def remove(self, ids: Iterable[int]) -> None:
+        if self._slots is None:
+            self._slots = {pid: slot for slot, pid in enumerate(self.doc_ids.tolist())}
+        for pid in ids:
+            if self._pending.pop(pid, None) is None and pid in self._slots:
+                self._removed.add(self._slots[pid])
+
+    def compact(self) -> None:
+        """Merges buffered additions and removals into the posting arrays."""
+        with self._compact_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        if not self._pending and not self._removed and len(self.offsets) == len(self.vocab) + 1:
+            return
+        # Existing postings as (term, slot, tf) triples, without removed passages
+        terms = np.repeat(np.arange(len(self.offsets) - 1, dtype=np.int64), np.diff(self.offsets))
+        docs, tfs = self.docs.astype(np.int64), self.tfs
+        alive = np.ones(len(self.doc_ids), dtype=bool)
+        if self._removed:
+            alive[list(self._removed)] = False
+            keep = alive[docs]
+            terms, docs, tfs = terms[keep], docs[keep], tfs[keep]
+        new_slot = np.cumsum(alive) - 1
+        docs = new_slot[docs]
+        doc_ids = [self.doc_ids[alive]]
+
+        # Buffered additions get the slots after the surviving ones
+        base = int(alive.sum())
+        add_terms, add_docs, add_tfs = [], [], []
+        for i, counts in enumerate(self._pending.values()):
+            add_terms.extend(counts.keys())
+            add_tfs.extend(min(tf, 65535) for tf in counts.values())
+            add_docs.extend([base + i] * len(counts))
+        doc_ids.append(np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending)))
+
+        terms = np.concatenate([terms, np.asarray(add_terms, dtype=np.int64)])
+        docs = np.concatenate([docs, np.asarray(add_docs, dtype=np.int64)])
+        tfs = np.concatenate([tfs, np.asarray(add_tfs, dtype=np.uint16)])
+        order = np.argsort(terms, kind="stable")
+
+        self.doc_ids = np.concatenate(doc_ids)
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=len(self.vocab)))]).astype(np.int64)
+        self.docs = docs[order].astype(np.int32)
+        self.tfs = tfs[order]
+        self.doc_len = np.bincount(docs, weights=tfs, minlength=len(self.doc_ids)).astype(np.float32)
+        self._slots = None
+        self._pending = {}
+        self._removed = set()
+        self._avgdl = None
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Top-k (passage id, BM25 score), best first. Passages added or removed
+        since the last compact() are not reflected.
+        """
+        vocab = self.vocab
+        # Terms added since the last compact() have no postings yet
+        n_terms = len(self.offsets) - 1
+        term_ids = {term_id for term_id in map(vocab.get, analyze(query)) if term_id is not None and term_id < n_terms}
+        n_docs = len(self.doc_ids)
+        if not term_ids or not n_docs:
+            return []
+
+        if self._avgdl is None:
+            self._avgdl = max(float(self.doc_len.mean()), 1.0)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term_id in term_ids:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            if start == end:
+                continue
+            docs = self.docs[start:end]
+            tf = self.tfs[start:end].astype(np.float32)
+            idf = np.log1p((n_docs - (end - start) + 0.5) / (end - start + 0.5))
+            # Each slot appears once per term, so fancy-index += is safe
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self._avgdl)
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        matched = matched[np.argsort(scores[matched])[::-1]]
+        return list(zip(self.doc_ids[matched].tolist(), scores[matched].tolist()))
+
+    def save(self, path: str) -> None:
+        self.compact()
+        directory = os.path.join(path, LEXICAL_DIR)
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(directory, name + ".npy"), getattr(self, name))
+
+        encoded = sorted((term.encode("utf-8"), term_id) for term, term_id in self.vocab.items())
+        with open(os.path.join(directory, "vocab.bin"), "wb") as f:
+            f.write(b"".join(term for term, _ in encoded))
+        lengths = np.fromiter((len(term) for term, _ in encoded), dtype=np.int64, count=len(encoded))
+        np.save(os.path.join(directory, "vocab_offsets.npy"), np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64))
+        np.save(os.path.join(directory, "vocab_ids.npy"),
+                np.fromiter((term_id for _, term_id in encoded), dtype=np.int64, count=len(encoded)))
+        with open(os.path.join(directory, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump({"k1": self.k1, "b": self.b, "size": len(encoded)}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "LexicalIndex":
+        """
+        mmap=True maps the arrays and vocabulary read-only; such an index can be
+        searched but not modified.
+        """
+        directory = os.path.join(path, LEXICAL_DIR)
+        with open(os.path.join(directory, "vocab.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(k1=meta["k1"], b=meta["b"])
+        mmap_mode = "r" if mmap else None
+        for name in ARRAYS:
+            setattr(index, name, np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode))
+
+        offsets, ids = (np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode) for name in VOCAB_ARRAYS)
+        if mmap:
+            index.vocab = MappedVocab(map_file(os.path.join(directory, "vocab.bin")), offsets, ids)
+        else:
+            with open(os.path.join(directory, "vocab.bin"), "rb") as f:
+                vocab = MappedVocab(f.read(), offsets, ids)
+            index.vocab = dict(zip(vocab, ids.tolist()))
+        return index
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return all(os.path.exists(os.path.join(path, LEXICAL_DIR, name)) for name in ("vocab.json", "vocab.bin"))
@@ -0,0 +1,209 @@
+# Shared scheduler for outbound model (Gemini / LLM) calls
+# - global concurrency cap, granted in priority order (crisis first)
+# - per-client token buckets so one streaming client cannot starve others
+# - deadline-aware shedding: requests that waited past their deadline are
+#   rejected instead of being sent late
+# - retry with jittered exponential backoff on upstream 429s
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from backend.app.core.config import get_settings
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    CRISIS = 0     # safety-flagged conversations; also exempt from client rate limits
+    REALTIME = 1   # live navigation frames
+    STANDARD = 2   # chat, text simplification
+
+
+class DeadlineExceeded(Exception):
+    """The request could not get a model slot before its deadline and was shed."""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+def _granted(future: asyncio.Future) -> bool:
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Takes one token, possibly on credit, and returns how long to wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self) -> None:
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class ModelScheduler:
+    def __init__(self, max_concurrency: int = 8, client_rate: float = 2.0, client_burst: float = 5.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 queue_timeout: float = 10.0, max_clients: int = 10000):
+        self.max_concurrency = max_concurrency
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_timeout = queue_timeout
+        self.max_clients = max_clients
+
+        self._active = 0
+        # (priority, seq, deadline, future) - seq keeps FIFO order within a priority
+        self._queue: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._waits: Dict[Priority, Deque[float]] = {p: deque(maxlen=4096) for p in Priority}
+        self.counters = {"granted": 0, "shed": 0, "retries": 0, "rate_limited": 0}
+
+    def _bucket(self, client_id: str) -> TokenBucket:
+        bucket = self._buckets.get(client_id)
+        if bucket is None:
+            bucket = self._buckets[client_id] = TokenBucket(self.client_rate, self.client_burst)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(client_id)
+        return bucket
+
+    async def _acquire(self, client_id: Optional[str], priority: Priority, deadline: float) -> None:
+        started = time.monotonic()
+
+        if client_id is not None and priority != Priority.CRISIS:
+            bucket = self._bucket(client_id)
+            delay = bucket.reserve()
+            if delay:
+                if started + delay > deadline:
+                    bucket.refund()
+                    self.counters["shed"] += 1
+                    raise DeadlineExceeded(f"Client {client_id} is over its request rate")
+                await asyncio.sleep(delay)
+
+        # Live waiters only exist while every slot is taken, so a free slot can be granted directly
+        if self._active < self.max_concurrency:
+            self._active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (priority, next(self._seq), deadline, future))
+            try:
+                await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                if _granted(future):
+                    self._release()  # granted just as the deadline hit
+                else:
+                    future.cancel()
+                self.counters["shed"] += 1
+                raise DeadlineExceeded("Timed out waiting for a model slot")
+            except asyncio.CancelledError:
+                if _granted(future):
+                    self._release()
+                else:
+                    future.cancel()
+                raise
+
+        self.counters["granted"] += 1
+        self._waits[priority].append(time.monotonic() - started)
+
+    def _release(self) -> None:
+        now = time.monotonic()
+        while self._queue:
+            _, _, deadline, future = heapq.heappop(self._queue)
+            if future.done():
+                continue  # waiter gave up
+            if deadline < now:
+                self.counters["shed"] += 1
+                future.set_exception(DeadlineExceeded("Deadline passed while queued for a model slot"))
+                continue
+            future.set_result(None)  # slot passes straight to the next waiter
+            return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, client_id: Optional[str] = None, priority: Priority = Priority.STANDARD,
+                   timeout: Optional[float] = None):
+        """Holds one model slot for the body, e.g. around a streaming LLM generation."""
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        await self._acquire(client_id, priority, deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def run(self, call: Callable[[], Awaitable[T]], client_id: Optional[str] = None,
+                  priority: Priority = Priority.STANDARD, timeout: Optional[float] = None) -> T:
+        """Runs `call()` under a slot, retrying upstream 429s with full-jitter backoff."""
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        attempt = 0
+        while True:
+            await self._acquire(client_id, priority, deadline)
+            try:
+                return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.counters["rate_limited"] += 1
+                if attempt >= self.max_retries:
+                    raise
+            finally:
+                self._release()
+
+            attempt += 1
+            self.counters["retries"] += 1
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+            if time.monotonic() + delay > deadline:
+                self.counters["shed"] += 1
+                raise DeadlineExceeded("Upstream rate limited past the request deadline")
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict:
+        waits = {}
+        for priority, samples in self._waits.items():
+            if samples:
+                ordered = sorted(samples)
+                pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3, 2)
+                waits[priority.name.lower()] = {"p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+        return {
+            **self.counters,
+            "active": self._active,
+            "queued": sum(1 for *_, f in self._queue if not f.done()),
+            "queue_wait": waits,
+        }
+
+
+def _from_settings() -> ModelScheduler:
+    settings = get_settings()
+    return ModelScheduler(
+        max_concurrency=settings.MODEL_MAX_CONCURRENCY,
+        client_rate=settings.MODEL_CLIENT_RATE_PER_SECOND,
+        client_burst=settings.MODEL_CLIENT_BURST,
+        max_retries=settings.MODEL_MAX_RETRIES,
+        backoff_base=settings.MODEL_BACKOFF_BASE_SECONDS,
+        queue_timeout=settings.MODEL_QUEUE_TIMEOUT_SECONDS,
+    )
+
+
+model_scheduler = _from_settings()
@@ -0,0 +1,133 @@
+# Content-addressed result cache with single-flight request coalescing
+# Keys are sha256 of the normalised input. Entries live in an in-memory LRU
+# with a TTL, optionally backed by a SQLite file that survives restarts; each
+# write also deletes expired rows and the oldest rows beyond `max_disk_rows`.
+# Concurrent misses for the same key share one upstream call.
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def content_key(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def _retrieve_exception(task: asyncio.Future) -> None:
+    # Marks the exception retrieved so one with no waiters left is not logged as unhandled
+    if not task.cancelled():
+        task.exception()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 7 * 24 * 3600,
+                 disk_path: Optional[str] = None, max_disk_rows: int = 100_000):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.max_disk_rows = max_disk_rows
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0}
+
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)")
+            self._db.commit()
+
+    async def get_or_compute(self, text: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached value for `text`, or awaits `compute()` once for all
+        concurrent callers. Exceptions reach every waiter and are not cached.
+        """
+        key = content_key(text)
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if time.time() - stored_at <= self.ttl:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+            del self._memory[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            # Detached from this caller: if it disconnects, only its own wait is
+            # cancelled and the coalesced callers still get the result
+            task = asyncio.ensure_future(self._fill(key, compute))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await self._disk_get(key)
+            if value is not None:
+                self.stats["disk_hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                value = await compute()
+                await self._disk_put(key, value)
+            self._put(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _put(self, key: str, value: Any) -> None:
+        self._memory[key] = (value, time.time())
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _disk_get(self, key: str) -> Optional[Any]:
+        if self._db is None:
+            return None
+
+        def read():
+            return self._db.execute("SELECT value, stored_at FROM results WHERE key = ?", (key,)).fetchone()
+
+        try:
+            row = await asyncio.to_thread(read)
+        except sqlite3.Error as e:
+            print(f"Warning: result cache read failed: {e}")
+            return None
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    async def _disk_put(self, key: str, value: Any) -> None:
+        if self._db is None:
+            return
+
+        def write():
+            now = time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now),
+            )
+            self._db.execute("DELETE FROM results WHERE stored_at < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_rows,),
+            )
+            self._db.commit()
+
+        try:
+            await asyncio.to_thread(write)
+        except Exception as e:
+            # The value is still good; it just won't survive a restart
+            print(f"Warning: result cache write failed: {e}")
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "entries": len(self._memory), "inflight": len(self._inflight)}
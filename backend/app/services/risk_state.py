@@ -0,0 +1,96 @@
+# Incremental multi-turn risk scoring
+# Each conversation carries a RiskState that is updated once per user message
+# from that message's matcher hits only, so the cost per turn is O(new message)
+# no matter how long the conversation is. Category scores decay every turn;
+# plan and means mentions are remembered for a few turns so that a plan
+# mentioned earlier plus means mentioned now escalates to T007. A bare "plan"
+# only counts next to ideation in the same message; a self-directed phrase
+# ("planned it") counts on its own.
+
+from typing import Dict, List
+
+from backend.app.core.safety_data import AMBIGUOUS_SUBSTANCE_KEYWORDS
+
+# Score added per category hit, and the per-turn decay applied before adding
+CATEGORY_WEIGHTS = {"imminent": 2.0, "high": 1.0, "self_harm": 1.0, "substance": 0.5}
+DECAY = 0.8
+
+# Ideation score above which earlier turns still count as an ideation context
+IDEATION_ACTIVE = 0.3
+# Repeated ideation across recent turns (e.g. three high hits in a row) starts a safety plan (T003)
+IDEATION_ESCALATION = 2.0
+# How many user turns a plan / means mention is remembered
+MEMORY_TURNS = 10
+
+
+def has_plan(hits: Dict[str, List[str]]) -> bool:
+    """Self-directed plan phrasing, or a plan word in a message that also voices ideation."""
+    return "self_plan" in hits or ("plan" in hits and ("high" in hits or "imminent" in hits))
+
+
+class RiskState:
+    __slots__ = ("turn", "ideation", "self_harm", "substance", "plan_turn", "means_turn")
+
+    def __init__(self):
+        self.turn = 0
+        self.ideation = 0.0
+        self.self_harm = 0.0
+        self.substance = 0.0
+        self.plan_turn = -1
+        self.means_turn = -1
+
+    def update(self, hits: Dict[str, List[str]]) -> None:
+        """Folds one user message's matcher hits into the state."""
+        self.turn += 1
+        self.ideation = self.ideation * DECAY + CATEGORY_WEIGHTS["imminent"] * ("imminent" in hits) \
+            + CATEGORY_WEIGHTS["high"] * ("high" in hits)
+        self.self_harm = self.self_harm * DECAY + CATEGORY_WEIGHTS["self_harm"] * ("self_harm" in hits)
+        self.substance = self.substance * DECAY + CATEGORY_WEIGHTS["substance"] * ("substance" in hits)
+        if has_plan(hits):
+            self.plan_turn = self.turn
+        if "means" in hits:
+            self.means_turn = self.turn
+
+    def _recent(self, turn: int) -> bool:
+        return turn > 0 and self.turn - turn < MEMORY_TURNS
+
+    def assess(self, hits: Dict[str, List[str]]) -> Dict:
+        """
+        Risk for the current message given the accumulated state. Same shape as
+        RAGService._assess_risk: {level, template, alert}. Call after update().
+        """
+        # 1. Imminent keywords in this message
+        if "imminent" in hits:
+            return {"level": "imminent", "template": "T002", "alert": True}
+
+        ideation_context = "high" in hits or self.ideation > IDEATION_ACTIVE
+        plan = has_plan(hits)
+
+        # 2. Plan and means both on record, one of them new this turn, during ideation
+        if ideation_context and self._recent(self.plan_turn) and self._recent(self.means_turn) \
+                and (plan or "means" in hits):
+            return {"level": "imminent", "template": "T007", "alert": True}
+
+        # 3. Suicidal ideation
+        if "high" in hits:
+            if plan:
+                return {"level": "imminent", "template": "T001", "alert": True}
+            if self.ideation >= IDEATION_ESCALATION:
+                return {"level": "high", "template": "T003", "alert": True}
+            return {"level": "high", "template": "T004", "alert": True}
+
+        # A plan mentioned after earlier ideation ("I've planned it")
+        if plan and ideation_context:
+            return {"level": "imminent", "template": "T001", "alert": True}
+
+        # 4. Self harm
+        if "self_harm" in hits:
+            return {"level": "high", "template": "T005", "alert": True}
+
+        # 5. Substance; escalated when a clear substance term follows recent ideation
+        if "substance" in hits:
+            if ideation_context and not AMBIGUOUS_SUBSTANCE_KEYWORDS.issuperset(hits["substance"]):
+                return {"level": "high", "template": "T006", "alert": True}
+            return {"level": "moderate", "template": "T006", "alert": False}
+
+        return {"level": "none", "template": None, "alert": False}
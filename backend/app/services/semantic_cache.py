@@ -0,0 +1,85 @@
+# Semantic response cache for routine chat questions
+# Entries are (language, query embedding) -> response dict. A query whose
+# embedding has cosine similarity >= threshold with a cached query in the
+# same language gets the cached response. Vectors live in one preallocated
+# matrix, so a lookup is a single matrix-vector product over at most
+# `capacity` rows (~0.2 ms at 2048 x 384). When full, expired entries are
+# replaced first, then the least recently used.
+# Crisis / safety responses are never stored or served from here; callers
+# only consult the cache for messages assessed as risk level "none".
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    def __init__(self, dim: int, threshold: float = 0.95, capacity: int = 2048, ttl_seconds: float = 3600):
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl_seconds
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.langs = np.full(capacity, -1, dtype=np.int32)   # -1 marks an empty slot
+        self.stored_at = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.values: List[Optional[dict]] = [None] * capacity
+        # Generation time of each entry, credited as time saved on every hit
+        self.costs = np.zeros(capacity, dtype=np.float64)
+        self._lang_ids: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "saved_ms": 0.0}
+
+    def __len__(self) -> int:
+        return int((self.langs >= 0).sum())
+
+    def lookup(self, language: str, vector: np.ndarray) -> Optional[dict]:
+        lang_id = self._lang_ids.get(language)
+        if lang_id is None:
+            self.stats["misses"] += 1
+            return None
+
+        now = time.monotonic()
+        similarity = self.vectors @ vector
+        similarity[(self.langs != lang_id) | (now - self.stored_at > self.ttl)] = -np.inf
+        slot = int(np.argmax(similarity))
+        if similarity[slot] < self.threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self.last_used[slot] = now
+        self.stats["hits"] += 1
+        self.stats["saved_ms"] += float(self.costs[slot])
+        return self.values[slot]
+
+    def store(self, language: str, vector: np.ndarray, value: dict, cost_ms: float = 0.0) -> None:
+        lang_id = self._lang_ids.setdefault(language, len(self._lang_ids))
+        now = time.monotonic()
+
+        empty = np.flatnonzero(self.langs < 0)
+        if len(empty):
+            slot = int(empty[0])
+        else:
+            expired = np.flatnonzero(now - self.stored_at > self.ttl)
+            slot = int(expired[0]) if len(expired) else int(np.argmin(self.last_used))
+            self.stats["evictions"] += 1
+
+        self.vectors[slot] = vector
+        self.langs[slot] = lang_id
+        self.stored_at[slot] = self.last_used[slot] = now
+        self.values[slot] = value
+        self.costs[slot] = cost_ms
+        self.stats["stores"] += 1
+
+    def clear(self) -> None:
+        self.langs[:] = -1
+        self.values = [None] * self.capacity
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "saved_ms": round(self.stats["saved_ms"], 1),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+            "threshold": self.threshold,
+        }
@@ -0,0 +1,139 @@
+# Server-side conversation sessions
+# In session mode the client sends only {session_id, message}. History is kept
+# here in compact __slots__ records, bounded by session count (LRU), idle TTL
+# and turns and tokens per session. window() returns the newest turns that
+# fit a token budget, which is the context a future LLM call would receive.
+# Sessions live in this process only: with several workers a follow-up could
+# reach a worker that never saw the session, so session mode is switched off
+# when WEB_CONCURRENCY (uvicorn's default for --workers) is above 1.
+
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional
+
+from backend.app.core.config import get_settings
+from backend.app.services.risk_state import RiskState
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting
+    return len(text) // 4 + 1
+
+
+class Turn:
+    __slots__ = ("role", "content", "tokens")
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+        self.tokens = estimate_tokens(content)
+
+
+class Session:
+    __slots__ = ("session_id", "turns", "tokens", "last_seen", "risk")
+
+    def __init__(self, session_id: str, max_turns: int):
+        self.session_id = session_id
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.tokens = 0
+        self.last_seen = time.monotonic()
+        # Carried across turns so risk scoring only scans the new message
+        self.risk = RiskState()
+
+
+class SessionStore:
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 1800,
+                 max_turns: int = 200, window_tokens: int = 2048, max_tokens: int = 8192,
+                 enabled: bool = True):
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.max_turns = max_turns
+        self.window_tokens = window_tokens
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+        # Least recently used first, so expired sessions collect at the front
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """The live session with this id, or None if it is unknown or expired."""
+        now = time.monotonic()
+        session = self._sessions.get(session_id)
+        if session is not None and now - session.last_seen > self.ttl:
+            del self._sessions[session_id]
+            session = None
+        if session is not None:
+            session.last_seen = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def create(self) -> Session:
+        """New session under a server-generated id; clients cannot choose ids."""
+        now = time.monotonic()
+        self._evict(now)
+        session = Session(uuid.uuid4().hex, self.max_turns)
+        session.last_seen = now
+        self._sessions[session.session_id] = session
+        return session
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_seen > self.ttl or len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+            else:
+                break
+
+    def append(self, session: Session, role: str, content: str) -> None:
+        if len(session.turns) == session.turns.maxlen:
+            session.tokens -= session.turns[0].tokens
+        turn = Turn(role, content)
+        session.turns.append(turn)
+        session.tokens += turn.tokens
+        while session.tokens > self.max_tokens and len(session.turns) > 1:
+            session.tokens -= session.turns.popleft().tokens
+
+    def window(self, session: Session, budget: Optional[int] = None) -> List[dict]:
+        """Newest turns, oldest first, within the token budget. Always includes the last turn."""
+        budget = self.window_tokens if budget is None else budget
+        selected = []
+        used = 0
+        for turn in reversed(session.turns):
+            if selected and used + turn.tokens > budget:
+                break
+            selected.append({"role": turn.role, "content": turn.content})
+            used += turn.tokens
+        selected.reverse()
+        return selected
+
+    def drop(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+def _single_worker() -> bool:
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY") or 1) <= 1
+    except ValueError:
+        return True
+
+
+def _from_settings() -> SessionStore:
+    settings = get_settings()
+    enabled = _single_worker()
+    if not enabled:
+        print("Warning: WEB_CONCURRENCY > 1; server-side chat sessions are disabled (single worker only)")
+    return SessionStore(
+        max_sessions=settings.SESSION_MAX_SESSIONS,
+        ttl_seconds=settings.SESSION_TTL_SECONDS,
+        max_turns=settings.SESSION_MAX_TURNS,
+        window_tokens=settings.SESSION_WINDOW_TOKENS,
+        max_tokens=settings.SESSION_MAX_TOKENS,
+        enabled=enabled,
+    )
+
+
+session_store = _from_settings()
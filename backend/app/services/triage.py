@@ -0,0 +1,174 @@
+# Offline safety / intent triage over exported chat transcripts
+# Re-runs the risk layer and the language/intent detection without generating
+# responses, for audits and for checking keyword changes against past traffic.
+# The input is JSONL with one conversation per line:
+#   {"id": ..., "messages": [{"role", "content"}, ...], "language": "en"}
+# A bare {"text": ...} or {"message": ...} line is a single user message.
+# Lines stream through a process pool in chunks. Output order follows input
+# order, and at most a few chunks are held in memory at once.
+#
+# Usage (from the repository root):
+#   python -m backend.app.services.triage transcripts.jsonl -o triage.jsonl --workers 8
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from backend.app.services.rag_service import RISK_MATCHER, rag_service
+from backend.app.services.risk_state import RiskState
+
+# Least to most severe
+LEVELS = ("none", "low", "moderate", "high", "imminent")
+_SEVERITY = {level: i for i, level in enumerate(LEVELS)}
+
+
+def triage(messages: List[dict], language: str = "en") -> Dict:
+    """
+    Risk and intent of the conversation's last user message, as chat would
+    assess it in session mode (RiskState carried over every user turn). Also
+    reports the peak level over all user turns, and `message_level` from the
+    last message alone (single-turn _assess_risk).
+    """
+    state = RiskState()
+    assessment = {"level": "none", "template": None, "alert": False}
+    peak = "none"
+    last = ""
+    for message in messages:
+        if message.get("role", "user") != "user":
+            continue
+        last = message.get("content") or ""
+        hits = RISK_MATCHER.find(last)
+        state.update(hits)
+        assessment = state.assess(hits)
+        if _SEVERITY.get(assessment["level"], 0) > _SEVERITY[peak]:
+            peak = assessment["level"]
+
+    last = last.lower()
+    detected_lang, intent = rag_service._detect(last, language)
+    return {
+        "level": assessment["level"],
+        "template": assessment["template"],
+        "alert": assessment["alert"],
+        "peak_level": peak,
+        "message_level": rag_service._assess_risk(last)["level"],
+        "language": detected_lang,
+        "intent": intent,
+    }
+
+
+def triage_record(record: dict) -> Dict:
+    if "messages" in record:
+        messages = record["messages"]
+    else:
+        messages = [{"role": "user", "content": record.get("text") or record.get("message") or ""}]
+    result = triage(messages, record.get("language") or "en")
+    if "id" in record:
+        result = {"id": record["id"], **result}
+    return result
+
+
+def triage_chunk(chunk: Tuple[int, List[str]]) -> Tuple[List[str], Counter]:
+    """
+    Worker entry point: (first line number, raw lines) -> (output JSONL lines,
+    counts). Output is serialised here so the parent process only writes it.
+    """
+    first_line, lines = chunk
+    out: List[str] = []
+    counts: Counter = Counter()
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            result = triage_record(json.loads(line))
+        except (ValueError, TypeError, AttributeError) as e:
+            counts["errors"] += 1
+            out.append(json.dumps({"line": number, "error": str(e)}, ensure_ascii=False))
+            continue
+        counts["lines"] += 1
+        counts["level:" + result["level"]] += 1
+        counts["peak:" + result["peak_level"]] += 1
+        out.append(json.dumps(result, ensure_ascii=False))
+    return out, counts
+
+
+def read_chunks(source: TextIO, chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    chunk: List[str] = []
+    first = 1
+    for number, line in enumerate(source, start=1):
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield first, chunk
+            first, chunk = number + 1, []
+    if chunk:
+        yield first, chunk
+
+
+def _results(chunks: Iterable[Tuple[int, List[str]]], workers: int) -> Iterator[Tuple[List[str], Counter]]:
+    """Chunk results in input order, with at most 2 x workers chunks in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield triage_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+        for chunk in chunks:
+            inflight.append(pool.submit(triage_chunk, chunk))
+            if len(inflight) >= 2 * workers:
+                yield inflight.popleft().result()
+        while inflight:
+            yield inflight.popleft().result()
+
+
+def run(source: TextIO, sink: Optional[TextIO], workers: int = 1, chunk_size: int = 2000,
+        progress_seconds: float = 5.0) -> dict:
+    """Triages every line of `source`, writing results to `sink` (None = counts only). Returns run stats."""
+    totals: Counter = Counter()
+    started = last_report = time.perf_counter()
+    for out, counts in _results(read_chunks(source, chunk_size), workers):
+        if sink is not None and out:
+            sink.write("\n".join(out) + "\n")
+        totals.update(counts)
+        now = time.perf_counter()
+        if progress_seconds and now - last_report >= progress_seconds:
+            last_report = now
+            print(f"{totals['lines']} lines, {totals['lines'] / (now - started):.0f} lines/s", file=sys.stderr)
+
+    seconds = time.perf_counter() - started
+    return {
+        "lines": totals["lines"],
+        "errors": totals["errors"],
+        "levels": {level: totals["level:" + level] for level in LEVELS if totals["level:" + level]},
+        "peak_levels": {level: totals["peak:" + level] for level in LEVELS if totals["peak:" + level]},
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "lines_per_second": round(totals["lines"] / seconds, 1) if seconds else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run the AarogyaMitra safety and intent layers over JSONL transcripts.")
+    parser.add_argument("input", help="JSONL transcript file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Per-line results as JSONL (default: stdout; '' = counts only)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Lines per worker task")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = None if not args.output else sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run(source, sink, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        for f in (source, sink):
+            if f not in (None, sys.stdin, sys.stdout):
+                f.close()
+    print(json.dumps(stats, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
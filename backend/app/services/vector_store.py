@@ -0,0 +1,355 @@
+# FAISS-backed passage store for retrieval
+# On-disk layout of an index directory:
+#   index.faiss           - FAISS index (ids are passage ids)
+#   refine.faiss          - ivfpq only: 8-bit vectors used to re-rank candidates
+#   passages.jsonl        - one {"id", "text", "source"} object per line
+#   passage_ids.npy       - passage ids in file order, with
+#   passage_offsets.npy     the byte offset of each line (plus end of file)
+#   meta.json             - {"mode", "dim", "embedder", "next_id", "refine_factor"}
+#   lexical/              - BM25 index over the same passages (see lexical_index.py)
+#
+# VECTOR_DB_PATH holds published versions: publish() writes the directory
+# v<timestamp>/ and then atomically replaces the CURRENT file naming it, so
+# readers never see a half-written index. A directory without CURRENT is read
+# as a single unversioned index (the layout before versioning).
+#
+# load(mmap=True) maps the FAISS codes, passages and BM25 tables read-only, so
+# uvicorn workers on one host share a single copy through the page cache.
+
+import json
+import os
+import shutil
+import time
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backend.app.services.lexical_index import LexicalIndex, map_file, reciprocal_rank_fusion
+
+INDEX_FILE = "index.faiss"
+REFINE_FILE = "refine.faiss"
+PASSAGES_FILE = "passages.jsonl"
+PASSAGE_IDS_FILE = "passage_ids.npy"
+PASSAGE_OFFSETS_FILE = "passage_offsets.npy"
+META_FILE = "meta.json"
+VERSION_FILE = "CURRENT"
+VERSION_PREFIX = "v"
+
+# Superseded versions kept on disk for workers that have not reloaded yet
+KEEP_VERSIONS = 3
+
+# flat:  exact inner product, 4 bytes/dim
+# fp16:  scalar-quantised to float16, 2 bytes/dim, near-exact
+# ivfpq: inverted lists + product quantisation, ~pq_m bytes/vector, plus an
+#        8-bit copy (1 byte/dim) that re-ranks the top k * refine_factor
+#        candidates; PQ distances alone reach only ~0.5 recall@5
+INDEX_MODES = ("flat", "fp16", "ivfpq")
+
+# PQ codebooks use 8 bits -> 256 centroids, so training needs at least that many vectors
+MIN_IVFPQ_TRAINING = 256
+
+
+def current_version(root: str) -> Optional[str]:
+    """Name of the published version under `root`, or None for an unversioned index."""
+    try:
+        with open(os.path.join(root, VERSION_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_path(root: str) -> str:
+    version = current_version(root)
+    return os.path.join(root, version) if version else root
+
+
+class MappedPassages(Mapping):
+    """Read-only {id: passage} view over a memory-mapped passages.jsonl; lines are parsed on access."""
+
+    def __init__(self, path: str):
+        self._data = map_file(os.path.join(path, PASSAGES_FILE))
+        ids_path = os.path.join(path, PASSAGE_IDS_FILE)
+        if os.path.exists(ids_path):
+            self._ids = np.load(ids_path, mmap_mode="r")
+            self._offsets = np.load(os.path.join(path, PASSAGE_OFFSETS_FILE), mmap_mode="r")
+        else:
+            self._ids, self._offsets = _scan_passages(self._data)
+
+    def _position(self, pid) -> int:
+        i = int(np.searchsorted(self._ids, pid))
+        if i == len(self._ids) or self._ids[i] != pid:
+            return -1
+        return i
+
+    def __getitem__(self, pid: int) -> dict:
+        i = self._position(pid)
+        if i < 0:
+            raise KeyError(pid)
+        return json.loads(self._data[int(self._offsets[i]):int(self._offsets[i + 1])])
+
+    def __contains__(self, pid) -> bool:
+        return self._position(pid) >= 0
+
+    def __iter__(self):
+        return iter(self._ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def _scan_passages(data):
+    """Ids and line offsets of a passages.jsonl written without passage_offsets.npy."""
+    ids, offsets, position = [], [], 0
+    while position < len(data):
+        end = data.find(b"\n", position)
+        end = len(data) if end < 0 else end + 1
+        line = data[position:end]
+        if line.strip():
+            ids.append(json.loads(line)["id"])
+            offsets.append(position)
+        position = end
+    return np.asarray(ids, dtype=np.int64), np.asarray(offsets + [position], dtype=np.int64)
+
+
+class VectorStore:
+    def __init__(self, embedder, mode: str = "flat", dim: Optional[int] = None,
+                 nlist: int = 256, pq_m: int = 32, nprobe: int = 64, refine_factor: int = 10):
+        if mode not in INDEX_MODES:
+            raise ValueError(f"Unknown index mode '{mode}', expected one of {INDEX_MODES}")
+        self.embedder = embedder
+        self.mode = mode
+        self.dim = dim or embedder.dim
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        self.refine_factor = refine_factor
+        # ivfpq with refine_factor > 0: IndexIDMap2 over 8-bit vectors, same ids as the index
+        self.refine = None
+        self.passages: Dict[int, dict] = {}
+        self.next_id = 0
+        self.index = None if mode == "ivfpq" else self._new_index()
+        self.lexical = LexicalIndex()
+        # Set by load(): the published version name, and whether the files are mapped read-only
+        self.version: Optional[str] = None
+        self.read_only = False
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def _new_index(self, training: Optional[np.ndarray] = None):
+        import faiss
+
+        if self.mode == "flat":
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.dim))
+        if self.mode == "fp16":
+            return faiss.IndexIDMap2(
+                faiss.IndexScalarQuantizer(self.dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT)
+            )
+
+        # ivfpq: size the coarse quantiser to the training set (~39 points per list)
+        nlist = max(1, min(self.nlist, len(training) // 39))
+        quantizer = faiss.IndexFlatIP(self.dim)
+        index = faiss.IndexIVFPQ(quantizer, self.dim, nlist, self.pq_m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.train(training)
+        index.nprobe = min(self.nprobe, nlist)
+        return index
+
+    def _new_refine(self, training: np.ndarray):
+        import faiss
+
+        refine = faiss.IndexIDMap2(
+            faiss.IndexScalarQuantizer(self.dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        )
+        refine.train(training)
+        return refine
+
+    def add(self, passages: List[dict], vectors: Optional[np.ndarray] = None) -> List[int]:
+        """Appends passages (dicts with "text" and "source") and returns their ids."""
+        if not passages:
+            return []
+        self._check_writable()
+        if vectors is None:
+            vectors = self.embedder.encode([p["text"] for p in passages])
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        if self.index is None:
+            if len(vectors) < MIN_IVFPQ_TRAINING:
+                raise ValueError(
+                    f"ivfpq mode needs at least {MIN_IVFPQ_TRAINING} passages to train, got {len(vectors)}"
+                )
+            self.index = self._new_index(training=vectors)
+            if self.refine_factor > 0:
+                self.refine = self._new_refine(vectors)
+
+        ids = np.arange(self.next_id, self.next_id + len(passages), dtype=np.int64)
+        self.index.add_with_ids(vectors, ids)
+        if self.refine is not None:
+            self.refine.add_with_ids(vectors, ids)
+        for pid, passage in zip(ids.tolist(), passages):
+            self.passages[pid] = {"id": pid, "text": passage["text"], "source": passage.get("source", "")}
+        self.lexical.add(ids.tolist(), (p["text"] for p in passages))
+        self.next_id += len(passages)
+        return ids.tolist()
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = [i for i in ids if i in self.passages]
+        if not ids or self.index is None:
+            return
+        self._check_writable()
+        self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+        if self.refine is not None:
+            self.refine.remove_ids(np.asarray(ids, dtype=np.int64))
+        self.lexical.remove(ids)
+        for pid in ids:
+            del self.passages[pid]
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError("Vector store is memory-mapped read-only; load it with mmap=False to modify it")
+
+    def search_vectors(self, vectors: np.ndarray, k: int = 3) -> List[List[dict]]:
+        if self.index is None or not self.passages:
+            return [[] for _ in range(len(vectors))]
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.refine is None:
+            scores, ids = self.index.search(vectors, k)
+        else:
+            scores, ids = self._rerank(vectors, self.index.search(vectors, k * self.refine_factor)[1], k)
+        results = []
+        for row_scores, row_ids in zip(scores, ids):
+            hits = []
+            for score, pid in zip(row_scores.tolist(), row_ids.tolist()):
+                passage = self.passages.get(pid)
+                if passage is not None:
+                    hits.append({**passage, "score": score})
+            results.append(hits)
+        return results
+
+    def _rerank(self, vectors: np.ndarray, candidates: np.ndarray, k: int):
+        """Re-scores ivfpq candidate ids against the 8-bit vectors and keeps the best k per query."""
+        scores = np.full((len(vectors), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(vectors), k), -1, dtype=np.int64)
+        for row, (query, found) in enumerate(zip(vectors, candidates)):
+            found = found[found >= 0]
+            if not len(found):
+                continue
+            refined = self.refine.reconstruct_batch(found) @ query
+            order = np.argsort(-refined)[:k]
+            scores[row, :len(order)] = refined[order]
+            ids[row, :len(order)] = found[order]
+        return scores, ids
+
+    def search(self, query: str, k: int = 3) -> List[dict]:
+        return self.search_vectors(self.embedder.encode([query]), k)[0]
+
+    def search_lexical(self, query: str, k: int = 3) -> List[dict]:
+        return [{**self.passages[pid], "score": score}
+                for pid, score in self.lexical.search(query, k) if pid in self.passages]
+
+    def search_hybrid(self, query: str, vector: np.ndarray, k: int = 3,
+                      candidates: int = 20, rrf_k: int = 60) -> List[dict]:
+        """
+        Reciprocal rank fusion of the top `candidates` vector and BM25 hits.
+        `vector` is the query embedding (1-D). The score is the fused RRF score.
+        """
+        dense = [hit["id"] for hit in self.search_vectors(vector[None, :], candidates)[0]]
+        lexical = [pid for pid, _ in self.lexical.search(query, candidates)]
+        fused = reciprocal_rank_fusion([dense, lexical], k=rrf_k)[:k]
+        return [{**self.passages[pid], "score": score} for pid, score in fused if pid in self.passages]
+
+    def save(self, path: str) -> None:
+        import faiss
+
+        os.makedirs(path, exist_ok=True)
+        if self.index is not None:
+            faiss.write_index(self.index, os.path.join(path, INDEX_FILE))
+        if self.refine is not None:
+            faiss.write_index(self.refine, os.path.join(path, REFINE_FILE))
+        ids = sorted(self.passages)
+        offsets = [0]
+        with open(os.path.join(path, PASSAGES_FILE), "wb") as f:
+            for pid in ids:
+                line = (json.dumps(self.passages[pid], ensure_ascii=False) + "\n").encode("utf-8")
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(os.path.join(path, PASSAGE_IDS_FILE), np.asarray(ids, dtype=np.int64))
+        np.save(os.path.join(path, PASSAGE_OFFSETS_FILE), np.asarray(offsets, dtype=np.int64))
+        self.lexical.save(path)
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"mode": self.mode, "dim": self.dim, "embedder": self.embedder.name,
+                       "next_id": self.next_id, "refine_factor": self.refine_factor}, f)
+
+    def publish(self, root: str, keep: int = KEEP_VERSIONS) -> str:
+        """
+        Saves into a new version directory under `root` and atomically makes it
+        current. Returns the version name. Only the newest `keep` versions stay
+        on disk; readers still mapping a removed one keep their mapping.
+        """
+        os.makedirs(root, exist_ok=True)
+        version = f"{VERSION_PREFIX}{time.time_ns()}"
+        staging = os.path.join(root, "." + version)
+        self.save(staging)
+        os.rename(staging, os.path.join(root, version))
+
+        pointer = os.path.join(root, VERSION_FILE + ".tmp")
+        with open(pointer, "w", encoding="utf-8") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, os.path.join(root, VERSION_FILE))
+        self.version = version
+
+        versions = sorted(name for name in os.listdir(root)
+                          if name.startswith(VERSION_PREFIX) and name[len(VERSION_PREFIX):].isdigit())
+        for name in versions[:-keep]:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        return version
+
+    @classmethod
+    def load(cls, path: str, embedder, mmap: bool = False) -> "VectorStore":
+        """
+        Loads the current version under `path`. mmap=True maps the index files
+        read-only (search only; add/remove raise ValueError).
+        """
+        import faiss
+
+        version = current_version(path)
+        path = os.path.join(path, version) if version else path
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("embedder") not in (None, embedder.name):
+            print(f"Warning: index at {path} was built with '{meta['embedder']}', querying with '{embedder.name}'")
+
+        store = cls(embedder, mode=meta["mode"], dim=meta["dim"],
+                    refine_factor=meta.get("refine_factor", 0))
+        store.version = version
+        store.read_only = mmap
+        flags = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if mmap else 0
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            store.index = faiss.read_index(index_path, flags)
+        refine_path = os.path.join(path, REFINE_FILE)
+        if os.path.exists(refine_path) and store.refine_factor > 0:
+            store.refine = faiss.read_index(refine_path, flags)
+        if mmap:
+            store.passages = MappedPassages(path)
+        else:
+            with open(os.path.join(path, PASSAGES_FILE), encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        passage = json.loads(line)
+                        store.passages[passage["id"]] = passage
+        store.next_id = meta.get("next_id", max(store.passages, default=-1) + 1)
+        if LexicalIndex.exists(path):
+            store.lexical = LexicalIndex.load(path, mmap=mmap)
+        else:
+            # Index written before the lexical tier existed; rebuilt here, persisted on the next save
+            store.lexical.add(store.passages, (p["text"] for p in store.passages.values()))
+            # Merged before the store is searched from worker threads
+            store.lexical.compact()
+        return store
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return os.path.exists(os.path.join(resolve_path(path), META_FILE))
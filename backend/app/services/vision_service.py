@@ -1,68 +1,189 @@
-import os
-import google.generativeai as genai
-from PIL import Image
-import io
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import UploadFile
 
 from backend.app.core.config import get_settings
+from backend.app.core.metrics import VISION_STAGE_SECONDS
+from backend.app.services.image_preprocess import read_upload, prepare_image, UploadTooLarge
+from backend.app.services.frame_cache import FrameCache
+from backend.app.services.result_cache import ResultCache
+from backend.app.services.model_scheduler import model_scheduler, Priority, DeadlineExceeded
+from typing import Optional
+
+# Prompt for navigation/tour guide mode
+NAVIGATION_PROMPT = (
+    "You are a smart, real-time vision assistant for a visually impaired person. "
+    "Analyze the scene instantly and provide a structured, spoken-style response for safe navigation.\n\n"
+    "Focus on these 4 priorities:\n"
+    "1. **Navigation Path**: Is the path clear? Give direct commands (e.g., 'Walk forward typically', 'Stop, obstacle ahead', 'Veer left').\n"
+    "2. **Obstacles & Hazards**: Identify objects in the path (e.g., 'Chair in front', 'Stairs descending 5 feet away').\n"
+    "3. **People**: Detect if any persons are present, their approximate location, and action (e.g., 'A person standing to your right').\n"
+    "4. **Scene & Text**: Briefly describe where we are and read any critical signs (e.g., 'Office corridor', 'Exit sign ahead').\n\n"
+    "Keep the response concise, prioritizing safety first. "
+    "Use natural language suitable for text-to-speech."
+)
+
+READ_SECONDS = VISION_STAGE_SECONDS.labels("upload_read")
+DECODE_SECONDS = VISION_STAGE_SECONDS.labels("decode_resize")
+ENCODE_SECONDS = VISION_STAGE_SECONDS.labels("encode")
+MODEL_SECONDS = VISION_STAGE_SECONDS.labels("model_call")
 
 class VisionService:
     def __init__(self):
         # Configure Gemini
         settings = get_settings()
         api_key = settings.GOOGLE_API_KEY
+        self.max_upload_bytes = settings.VISION_MAX_UPLOAD_BYTES
+        self.read_chunk_bytes = settings.VISION_READ_CHUNK_BYTES
+        self.max_dimension = settings.VISION_MAX_DIMENSION
+        self.jpeg_quality = settings.VISION_JPEG_QUALITY
+        # PIL decode/resize runs here so large photos never block the event loop
+        self.executor = ThreadPoolExecutor(max_workers=settings.VISION_PREPROCESS_WORKERS, thread_name_prefix="vision-prep")
+        self.frame_cache = FrameCache(
+            max_distance=settings.VISION_FRAME_CACHE_DISTANCE,
+            ttl_seconds=settings.VISION_FRAME_CACHE_TTL_SECONDS,
+            frames_per_client=settings.VISION_FRAME_CACHE_FRAMES,
+            max_clients=settings.VISION_FRAME_CACHE_CLIENTS,
+            min_bits=settings.VISION_FRAME_CACHE_MIN_BITS,
+        )
+        self.simplify_cache = ResultCache(
+            max_entries=settings.SIMPLIFY_CACHE_SIZE,
+            ttl_seconds=settings.SIMPLIFY_CACHE_TTL_SECONDS,
+            disk_path=settings.SIMPLIFY_CACHE_PATH or None,
+            max_disk_rows=settings.SIMPLIFY_CACHE_DISK_ROWS,
+        )
         
+        # Gemini clients are created on first use (or by warm_up()); importing
+        # google.generativeai alone takes about a second
+        self.model = None
+        self.text_model = None
+        self._load_lock = threading.Lock()
+
         # Check for placeholder or missing key
-        if not api_key or api_key == "YOUR_GEMINI_API_KEY_HERE":
-            self.model = None
-            self.text_model = None
+        self.api_key = api_key
+        self.configured = bool(api_key) and api_key != "YOUR_GEMINI_API_KEY_HERE"
+        if not self.configured:
             print("Warning: GOOGLE_API_KEY not found or is default. Vision service will not function.")
-        else:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            self.text_model = genai.GenerativeModel('gemini-1.5-flash')
 
-    async def analyze_image(self, file: UploadFile) -> dict:
+    def warm_up(self) -> None:
+        """Imports the Gemini SDK and builds the models. Blocking; safe to call more than once."""
+        if not self.configured:
+            return
+        with self._load_lock:
+            if self.model is not None and self.text_model is not None:
+                return
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key)
+            self.model = self.model or genai.GenerativeModel('gemini-1.5-flash')
+            self.text_model = self.text_model or genai.GenerativeModel('gemini-1.5-flash')
+
+    async def _ensure_models(self) -> None:
+        if self.configured and (self.model is None or self.text_model is None):
+            await asyncio.to_thread(self.warm_up)
+
+    def status(self) -> dict:
+        return {"configured": self.configured, "loaded": self.model is not None}
+
+    async def analyze_image(self, file: UploadFile, client_id: Optional[str] = None) -> dict:
+        """
+        Describes a navigation frame. With a client_id sent by the device, frames
+        that look like one the same client sent recently reuse that description
+        (see FrameCache). Without one, every frame goes to the model.
+        """
+        await self._ensure_models()
+        if not self.model:
+            return {"error": "Vision service not configured. Please set a valid GOOGLE_API_KEY in .env file."}
+
+        try:
+            start = time.perf_counter()
+            contents = await read_upload(file, self.max_upload_bytes, self.read_chunk_bytes)
+            read_ms = (time.perf_counter() - start) * 1e3
+            READ_SECONDS.observe(read_ms / 1e3)
+        except UploadTooLarge as e:
+            return {"error": str(e), "status_code": 413}
+        except Exception as e:
+            print(f"Vision Service Error: {e}")
+            return {"error": f"AI Processing Failed: {str(e)}"}
+
+        return await self.analyze_bytes(contents, client_id=client_id, timings={"read_ms": read_ms})
+
+    async def analyze_bytes(self, contents: bytes, client_id: Optional[str] = None, timings: Optional[dict] = None) -> dict:
+        """analyze_image for an already-received frame (used by the WebSocket stream)."""
+        await self._ensure_models()
         if not self.model:
             return {"error": "Vision service not configured. Please set a valid GOOGLE_API_KEY in .env file."}
+        if len(contents) > self.max_upload_bytes:
+            return {"error": f"Image exceeds the {self.max_upload_bytes // (1024 * 1024)} MB upload limit", "status_code": 413}
 
+        timings = dict(timings or {})
         try:
-            # Read file bytes
-            contents = await file.read()
-            image = Image.open(io.BytesIO(contents))
-
-            # Prompt for navigation/tour guide mode
-            prompt = (
-                "You are a smart, real-time vision assistant for a visually impaired person. "
-                "Analyze the scene instantly and provide a structured, spoken-style response for safe navigation.\n\n"
-                "Focus on these 4 priorities:\n"
-                "1. **Navigation Path**: Is the path clear? Give direct commands (e.g., 'Walk forward typically', 'Stop, obstacle ahead', 'Veer left').\n"
-                "2. **Obstacles & Hazards**: Identify objects in the path (e.g., 'Chair in front', 'Stairs descending 5 feet away').\n"
-                "3. **People**: Detect if any persons are present, their approximate location, and action (e.g., 'A person standing to your right').\n"
-                "4. **Scene & Text**: Briefly describe where we are and read any critical signs (e.g., 'Office corridor', 'Exit sign ahead').\n\n"
-                "Keep the response concise, prioritizing safety first. "
-                "Use natural language suitable for text-to-speech."
+            prepared = await asyncio.get_running_loop().run_in_executor(
+                self.executor, prepare_image, contents, self.max_dimension, self.jpeg_quality
             )
-            
-            response = await self.model.generate_content_async([prompt, image])
+            timings["decode_resize_ms"] = prepared.decode_ms
+            timings["encode_ms"] = prepared.encode_ms
+            DECODE_SECONDS.observe(prepared.decode_ms / 1e3)
+            ENCODE_SECONDS.observe(prepared.encode_ms / 1e3)
+
+            if client_id is not None:
+                cached = self.frame_cache.lookup(client_id, prepared.frame_hash)
+                if cached is not None:
+                    return {
+                        "description": cached,
+                        "objects": [],
+                        "text_content": "",
+                        "cached": True,
+                        "timings": {stage: round(ms, 2) for stage, ms in timings.items()}
+                    }
+
+            start = time.perf_counter()
+            response = await model_scheduler.run(
+                lambda: self.model.generate_content_async(
+                    [NAVIGATION_PROMPT, {"mime_type": "image/jpeg", "data": prepared.data}]
+                ),
+                client_id=client_id,
+                priority=Priority.REALTIME,
+            )
+            timings["model_ms"] = (time.perf_counter() - start) * 1e3
+            MODEL_SECONDS.observe(timings["model_ms"] / 1e3)
+            if client_id is not None:
+                self.frame_cache.store(client_id, prepared.frame_hash, response.text)
             
             return {
                 "description": response.text,
                 "objects": [], # Could parse if needed, but description covers it
-                "text_content": "" 
+                "text_content": "",
+                "cached": False,
+                "timings": {stage: round(ms, 2) for stage, ms in timings.items()}
             }
+        except DeadlineExceeded as e:
+            return {"error": f"Vision service busy: {e}", "status_code": 503}
         except Exception as e:
             print(f"Vision Service Error: {e}")
             return {"error": f"AI Processing Failed: {str(e)}"}
 
-    async def simplify_text(self, text: str) -> dict:
+    async def simplify_text(self, text: str, client_id: Optional[str] = None) -> dict:
+        await self._ensure_models()
         if not self.text_model:
              return {"error": "API Key missing"}
         
-        try:
+        async def simplify() -> dict:
             prompt = f"Simplify the following text for easier reading/understanding:\n\n{text}"
-            response = await self.text_model.generate_content_async(prompt)
+            response = await model_scheduler.run(
+                lambda: self.text_model.generate_content_async(prompt),
+                client_id=client_id,
+                priority=Priority.STANDARD,
+            )
             return {"simplified_text": response.text}
+
+        try:
+            # Identical texts (report templates, discharge sheets) share one model call
+            return await self.simplify_cache.get_or_compute(text, simplify)
+        except DeadlineExceeded as e:
+            return {"error": f"Service busy: {e}", "status_code": 503}
         except Exception as e:
             return {"error": str(e)}
 
@@ -0,0 +1,85 @@
+# Continuous-vision frame pump with latest-frame-wins backpressure
+# Frames arrive faster than the model answers. Only the newest unprocessed
+# frame is kept (older ones are dropped), at most `max_inflight` analyses run
+# at once, and results older than one already sent are discarded, so the
+# client always hears about the most recent scene and memory stays bounded.
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+
+class FrameStream:
+    def __init__(self, analyze: Callable[[bytes], Awaitable[dict]],
+                 send: Callable[[dict], Awaitable[None]], max_inflight: int = 1):
+        self.analyze = analyze
+        self.send = send
+        self.max_inflight = max(1, max_inflight)
+        self._pending: Optional[Tuple[int, bytes, float]] = None
+        self._wakeup = asyncio.Event()
+        self._last_sent = 0
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+        self.completed = 0
+        self.stale = 0
+
+    def submit(self, data: bytes) -> int:
+        """Queues a frame, replacing any frame still waiting. Returns its frame id."""
+        self.received += 1
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (self.received, data, time.perf_counter())
+        self._wakeup.set()
+        return self.received
+
+    async def _worker(self) -> None:
+        while not self._closed:
+            await self._wakeup.wait()
+            if self._pending is None:
+                self._wakeup.clear()
+                continue
+            frame_id, data, received_at = self._pending
+            self._pending = None
+            self._wakeup.clear()
+
+            result = await self.analyze(data)
+            if frame_id < self._last_sent:
+                # A newer frame finished first; this answer describes an old scene
+                self.stale += 1
+                continue
+            self._last_sent = frame_id
+            self.completed += 1
+            try:
+                await self.send({
+                    "frame_id": frame_id,
+                    "latency_ms": round((time.perf_counter() - received_at) * 1e3, 2),
+                    "dropped": self.dropped,
+                    **result,
+                })
+            except Exception:
+                # Client went away mid-send
+                self._closed = True
+
+    async def run(self, receive: Callable[[], Awaitable[Optional[bytes]]]) -> None:
+        """Pumps frames from `receive` (None means the client closed) until the stream ends."""
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.max_inflight)]
+        try:
+            while not self._closed:
+                data = await receive()
+                if data is None:
+                    break
+                self.submit(data)
+        finally:
+            self._closed = True
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "stale": self.stale,
+        }
@@ -0,0 +1,44 @@
+# Minimal in-process ASGI driver for benchmarks: sends one HTTP request to the
+# app and records when the first and last body bytes go out.
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+
+async def call(app, path: str, payload: Optional[dict] = None, method: str = "POST",
+               headers: Optional[dict] = None) -> dict:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    started = time.perf_counter()
+    result = {"status": None, "first_chunk_ms": None, "total_ms": None, "chunks": 0,
+              "request_bytes": len(body), "body": b"", "headers": {}}
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body" and message.get("body"):
+            result["chunks"] += 1
+            result["body"] += message["body"]
+            if result["first_chunk_ms"] is None:
+                result["first_chunk_ms"] = (time.perf_counter() - started) * 1e3
+
+    raw_headers = [(b"content-type", b"application/json"), (b"host", b"bench")]
+    raw_headers += [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": raw_headers, "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    result["total_ms"] = (time.perf_counter() - started) * 1e3
+    return result
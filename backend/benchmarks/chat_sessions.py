@@ -0,0 +1,47 @@
+# Benchmark: request size and handler time at turn N of a conversation,
+# full-history requests vs session mode (session_id + new message only).
+# Run from the repository root: python -m backend.benchmarks.chat_sessions
+
+import asyncio
+import json
+import statistics
+
+from backend.benchmarks.asgi import call
+from backend.main import app
+
+USER_TURN = "Mujhe kal se halka bukhar hai aur sir mein dard bhi hai, kya karna chahiye? " * 2
+
+
+async def conversation(turns: int, session_mode: bool):
+    history = []
+    session_id = None
+    samples = []
+    for turn in range(turns):
+        message = {"role": "user", "content": f"({turn}) {USER_TURN}"}
+        if session_mode:
+            payload = {"message": message, "session_id": session_id}
+        else:
+            history.append(message)
+            payload = {"messages": history}
+        result = await call(app, "/api/v1/chat/", payload)
+        assert result["status"] == 200, result
+        body = json.loads(result["body"])
+        if session_mode:
+            session_id = body["session_id"]
+        else:
+            history.append({"role": "assistant", "content": body["response"]})
+        samples.append((result["request_bytes"], result["total_ms"]))
+    return samples
+
+
+async def main(turns: int = 50, repeats: int = 5) -> None:
+    print(f"{'mode':>13} {'bytes@turn' + str(turns):>14} {'handler_ms@turn' + str(turns):>19}")
+    for label, session_mode in (("full history", False), ("session", True)):
+        last = [(await conversation(turns, session_mode))[-1] for _ in range(repeats)]
+        size = last[0][0]
+        ms = statistics.median(t for _, t in last)
+        print(f"{label:>13} {size:>14} {ms:>19.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
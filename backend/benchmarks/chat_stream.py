@@ -0,0 +1,38 @@
+# Benchmark: time-to-first-byte of /api/v1/chat/ vs time-to-first-chunk of
+# /api/v1/chat/stream, with a local fake LLM generator plugged into rag_service.
+# Run from the repository root: python -m backend.benchmarks.chat_stream
+
+import asyncio
+
+from backend.benchmarks.asgi import call
+from backend.main import app
+from backend.app.services.rag_service import rag_service
+
+
+def fake_generator(token_delay: float, tokens: int):
+    async def generate(messages, language):
+        for i in range(tokens):
+            await asyncio.sleep(token_delay)
+            yield f"token{i} "
+    return generate
+
+
+async def main(token_delay: float = 0.02, tokens: int = 50) -> None:
+    rag_service.text_generator = fake_generator(token_delay, tokens)
+    generic = {"messages": [{"role": "user", "content": "what should I eat when I have a cold"}]}
+    crisis = {"messages": [{"role": "user", "content": "I want to die"}]}
+
+    print(f"fake generator: {tokens} tokens x {token_delay * 1e3:.0f} ms")
+    print(f"{'request':>22} {'first_chunk_ms':>15} {'total_ms':>9} {'chunks':>7}")
+    for label, path, payload in (
+        ("chat (generic)", "/api/v1/chat/", generic),
+        ("chat/stream (generic)", "/api/v1/chat/stream", generic),
+        ("chat (safety)", "/api/v1/chat/", crisis),
+        ("chat/stream (safety)", "/api/v1/chat/stream", crisis),
+    ):
+        t = await call(app, path, payload)
+        print(f"{label:>22} {t['first_chunk_ms']:>15.1f} {t['total_ms']:>9.1f} {t['chunks']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
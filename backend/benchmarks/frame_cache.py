@@ -0,0 +1,81 @@
+# Benchmark: perceptual-hash frame dedup on synthetic navigation sequences.
+# A stub model counts invocations; each "scene" is held for several frames
+# with sensor noise and small camera shifts before the next scene starts.
+# Then a client sends different near-uniform frames (dark, dim, grey), which
+# must each reach the model rather than reuse one another's description.
+# Run from the repository root: python -m backend.benchmarks.frame_cache
+
+import asyncio
+import io
+import random
+import sys
+
+from PIL import Image, ImageChops, ImageDraw
+from starlette.datastructures import UploadFile
+
+from backend.app.services.vision_service import vision_service
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, parts):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return type("Response", (), {"text": f"description #{self.calls}"})()
+
+
+def scene(seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    image = Image.new("RGB", (1280, 720), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(1200), rng.randrange(650)
+        draw.rectangle((x, y, x + rng.randint(40, 300), y + rng.randint(40, 300)),
+                       fill=tuple(rng.randrange(256) for _ in range(3)))
+    return image
+
+
+def jitter(image: Image.Image, rng: random.Random) -> bytes:
+    """Camera shake of a few pixels plus sensor noise, JPEG-encoded like a phone frame."""
+    shifted = ImageChops.offset(image, rng.randint(-6, 6), rng.randint(-4, 4))
+    noise = Image.effect_noise(image.size, 12).convert("RGB")
+    frame = Image.blend(shifted, noise, 0.06)
+    out = io.BytesIO()
+    frame.save(out, format="JPEG", quality=80)
+    return out.getvalue()
+
+
+async def run(scenes: int = 10, frames_per_scene: int = 15, clients: int = 3) -> None:
+    model = CountingModel()
+    vision_service.configured = True
+    vision_service.model = vision_service.text_model = model
+    rng = random.Random(1)
+    total = 0
+    for client in range(clients):
+        for s in range(scenes):
+            base = scene(client * 1000 + s)
+            for _ in range(frames_per_scene):
+                result = await vision_service.analyze_image(UploadFile(io.BytesIO(jitter(base, rng))), client_id=f"c{client}")
+                assert "error" not in result, result
+                total += 1
+
+    stats = vision_service.frame_cache.stats()
+    print(f"frames={total} model_calls={model.calls} distinct_scenes={scenes * clients}")
+    print(f"cache: {stats}")
+
+    descriptions = set()
+    for shade in ((0, 0, 0), (20, 20, 24), (128, 128, 128), (250, 250, 250)):
+        for _ in range(3):
+            flat = jitter(Image.new("RGB", (1280, 720), shade), rng)
+            result = await vision_service.analyze_image(UploadFile(io.BytesIO(flat)), client_id="flat")
+            if result["cached"]:
+                print(f"FAIL: near-uniform frame {shade} answered from cache")
+                sys.exit(1)
+            descriptions.add(result["description"])
+    print(f"near-uniform frames: {len(descriptions)} model calls, none cached")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
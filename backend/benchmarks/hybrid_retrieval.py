@@ -0,0 +1,103 @@
+# Benchmark: vector-only vs BM25-only vs hybrid (RRF) retrieval on a synthetic
+# multilingual corpus. Passages use one spelling of a romanised Hindi / Marathi /
+# Bengali / Tamil symptom term; queries use other spellings ("bukhaar", "jvar",
+# "sar dard") wrapped in conversational filler. A hit is a passage on the
+# query's topic. Uses the offline hashing embedder.
+# Run from the repository root: python -m backend.benchmarks.hybrid_retrieval
+
+import random
+import statistics
+import time
+
+from backend.app.services.embeddings import HashingEmbedder
+from backend.app.services.vector_store import VectorStore
+
+TOPICS = {
+    "fever": ["fever", "bukhar", "taap", "jwar", "jvor", "kaichal"],
+    "headache": ["headache", "sir dard", "doke dukhi", "matha byatha", "thalai vali"],
+    "cough": ["cough", "khansi", "khokla", "kashi", "irumal"],
+    "diarrhoea": ["diarrhoea", "dast", "julab", "pet kharap", "vayitru pokku"],
+    "stomach": ["stomach pain", "pet dard", "pot dukhi", "pet byatha", "vayiru vali"],
+    "cold": ["cold", "jukam", "sardi", "sardi jukam", "jaladosham"],
+}
+
+ADVICE = (
+    "drink water fluids rest sleep doctor visit clinic temperature tablet dose twice daily "
+    "children elders warm food avoid oily spicy hygiene wash hands monitor symptoms days "
+    "if worse consult helpline nearest hospital ors salt sugar paani aaram dawai doctor ko dikhayein"
+).split()
+
+FILLER = ["mujhe", "hai", "kya", "karu", "bahut", "since yesterday", "amma ko", "baby has", "please help", "kal se"]
+
+
+def _variant(term: str, rng: random.Random) -> str:
+    """A different romanisation of the same word, as users actually type it."""
+    swaps = [("a", "aa"), ("i", "ee"), ("u", "oo"), ("v", "w"), ("w", "v"), ("s", "sh"), ("j", "z"), ("f", "ph")]
+    out = term
+    for old, new in rng.sample(swaps, 3):
+        if old in out and rng.random() < 0.7:
+            out = out.replace(old, new, 1)
+    return out
+
+
+def corpus(per_term: int, seed: int = 5):
+    rng = random.Random(seed)
+    passages, topics = [], []
+    for topic, terms in TOPICS.items():
+        for term in terms:
+            for _ in range(per_term):
+                words = [rng.choice(ADVICE) for _ in range(rng.randint(25, 50))]
+                words.insert(rng.randrange(len(words)), term)
+                passages.append({"text": " ".join(words), "source": topic})
+                topics.append(topic)
+    return passages, topics
+
+
+def queries(count: int, seed: int = 9):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        topic = rng.choice(list(TOPICS))
+        term = _variant(rng.choice(TOPICS[topic][1:]), rng)
+        words = rng.sample(FILLER, 3) + [term]
+        rng.shuffle(words)
+        out.append((" ".join(words), topic))
+    return out
+
+
+def main(per_term: int = 600, query_count: int = 300, k: int = 5) -> None:
+    embedder = HashingEmbedder()
+    passages, _ = corpus(per_term)
+    store = VectorStore(embedder, mode="flat")
+    start = time.perf_counter()
+    store.add(passages)
+    store.lexical.compact()
+    build_s = time.perf_counter() - start
+    lexical_mb = sum(getattr(store.lexical, name).nbytes for name in ("offsets", "docs", "tfs", "doc_ids", "doc_len")) / 1e6
+    print(f"{len(passages)} passages, built in {build_s:.1f}s; BM25 postings {lexical_mb:.2f} MB")
+
+    qs = queries(query_count)
+    vectors = embedder.encode([q for q, _ in qs])
+    methods = {
+        "vector": lambda q, v: store.search_vectors(v[None, :], k)[0],
+        "bm25": lambda q, v: store.search_lexical(q, k),
+        "hybrid": lambda q, v: store.search_hybrid(q, v, k),
+    }
+
+    print(f"{'method':>7} {'hit@' + str(k):>7} {'precision@' + str(k):>13} {'p50_ms':>7} {'p95_ms':>7}")
+    for name, search in methods.items():
+        hits, precision, latencies = 0, [], []
+        for (query, topic), vector in zip(qs, vectors):
+            start = time.perf_counter()
+            results = search(query, vector)
+            latencies.append((time.perf_counter() - start) * 1e3)
+            relevant = sum(1 for hit in results if hit["source"] == topic)
+            hits += relevant > 0
+            precision.append(relevant / k)
+        latencies.sort()
+        print(f"{name:>7} {hits / len(qs):>7.3f} {statistics.mean(precision):>13.3f} "
+              f"{latencies[len(latencies) // 2]:>7.2f} {latencies[int(len(latencies) * 0.95)]:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Import-time budget for the API entry point. Exits non-zero (so it can gate CI)
+# if `import backend.main` in a fresh interpreter takes longer than the budget,
+# or if any heavy provider is imported eagerly instead of on first use.
+# Run from the repository root: python -m backend.benchmarks.import_time --budget-ms 1200
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Must not be imported by `import backend.main`; they load on first use or in warm-up
+LAZY_MODULES = ("google.generativeai", "PIL", "numpy", "faiss", "sentence_transformers", "torch")
+
+PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import backend.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'ms': elapsed * 1e3, 'loaded': [m for m in %r if m in sys.modules]}))\n"
+) % (LAZY_MODULES,)
+
+
+def measure() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=1200.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    times = sorted(run["ms"] for run in runs)
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    # Best of N: the first run also pays for cold disk caches
+    best = times[0]
+
+    print(f"import backend.main: best {best:.0f} ms, median {times[len(times) // 2]:.0f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    failures = []
+    if best > args.budget_ms:
+        failures.append(f"import time {best:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"eagerly imported: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
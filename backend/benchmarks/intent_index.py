@@ -0,0 +1,105 @@
+# Benchmark: inverted-index language/intent detection vs the old any()/in cascade
+# on long pasted messages (multi-paragraph lab reports). Also checks the
+# (language, intent) of short messages with inflected words, and exits non-zero
+# if one is wrong.
+# Run from the repository root: python -m backend.benchmarks.intent_index
+
+import sys
+import time
+
+from backend.app.core.intent_index import IntentIndex, DEFAULT_LEXICON_PATH
+
+LAB_REPORT_PARAGRAPH = (
+    "Complete Blood Count: Haemoglobin 11.2 g/dL (low), WBC 12,400 /uL (high), "
+    "Platelets 1.9 lakh /uL. ESR 38 mm/hr. Peripheral smear shows neutrophilic "
+    "leucocytosis. Patient reports intermittent fever for 4 days with chills and "
+    "body ache, mild headache in the evenings, no vomiting. Dengue NS1 negative, "
+    "Widal test pending. Advised hydration, paracetamol SOS and review after 48 hours. "
+)
+
+HINGLISH = ["hai", "kru", "kya", "kaise", "batao", "mujhe", "bukhar", "dard", "main", "kaisa", "sirdard", "tension", "exam"]
+PSYCH = ["depressed", "anxiety", "sad", "lonely", "stress", "worry", "panic", "fear", "scared", "hopeless", "mental", "brain", "emotion"]
+
+
+def cascade(text: str, language: str = "en"):
+    """The detection block generate_response used before the inverted index."""
+    text = text.lower()
+    is_marathi = any(k in text for k in ["ahe", "kay", "kasa", "dukh"])
+    is_bengali = any(k in text for k in ["hobe", "kemon", "jwar"])
+    is_tamil = any(k in text for k in ["irukku", "enna", "vali"])
+    is_hinglish = any(k in text for k in HINGLISH)
+    is_psych = any(k in text for k in PSYCH)
+    if is_marathi:
+        lang = "mr"
+    elif is_bengali:
+        lang = "bn"
+    elif is_tamil:
+        lang = "ta"
+    elif is_hinglish or language == "hi":
+        lang = "hi"
+    else:
+        lang = language
+    if "exam" in text or "stress" in text or "tension" in text or "padhai" in text:
+        intent = "exam_stress"
+    elif "headache" in text or "sir dard" in text or "sar dard" in text or "sirdard" in text:
+        intent = "headache"
+    elif is_psych:
+        intent = "psych"
+    elif "fever" in text or "bukhar" in text:
+        intent = "fever"
+    else:
+        intent = None
+    return lang, intent
+
+
+# (message, expected (language, intent)). The cascade matched substrings, so
+# inflected words need their own lexicon terms; the last two it missed entirely.
+INFLECTED = [
+    ("I feel so stressed", ("en", "exam_stress")),
+    ("I get very emotional at night", ("en", "psych")),
+    ("feeling feverish since morning", ("en", "fever")),
+    ("I have headaches every evening", ("en", "headache")),
+    ("mujhe bukhar hai", ("hi", "fever")),
+    ("i am worried about my mother", ("en", "psych")),
+    ("struggling with depression", ("en", "psych")),
+]
+
+
+def check_inflected(index: IntentIndex) -> list:
+    failures = []
+    for text, expected in INFLECTED:
+        detection = index.detect(text)
+        result = (detection.language or "en", detection.intents[0][0] if detection.intents else None)
+        if result != expected:
+            failures.append(f"{text!r}: expected {expected}, got {result}")
+    return failures
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat: int = 500) -> None:
+    index = IntentIndex.from_files([DEFAULT_LEXICON_PATH])
+    print(f"{'chars':>7} {'cascade_us':>11} {'index_us':>9}  cascade_result / index_result")
+    for paragraphs in (1, 5, 20, 80):
+        text = LAB_REPORT_PARAGRAPH * paragraphs
+        cascade_us = _time(lambda: cascade(text), repeat)
+        index_us = _time(lambda: index.detect(text), repeat)
+        detection = index.detect(text)
+        top = detection.intents[0][0] if detection.intents else None
+        print(f"{len(text):>7} {cascade_us:>11.1f} {index_us:>9.1f}  {cascade(text)} / {(detection.language, top)}")
+
+    failures = check_inflected(index)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(INFLECTED)} inflected messages detected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Load benchmark package: python -m backend.benchmarks.load --help
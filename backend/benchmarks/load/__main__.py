@@ -0,0 +1,170 @@
+# Load benchmark for the API. Drives backend.main:app in-process through
+# httpx's ASGI transport (Gemini replaced by a deterministic fake), or a running
+# server with --url. Writes a JSON report and can compare it to a baseline.
+#
+# Run from the repository root:
+#   python -m backend.benchmarks.load --concurrency 16 --requests 400 --output load.json
+#   python -m backend.benchmarks.load --baseline load.json --threshold 0.15
+#   python -m backend.benchmarks.load --url http://localhost:8000 --scenarios chat_fever,chat_safety
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from backend.benchmarks.load.scenarios import SCENARIOS
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_scenario(client, build, concurrency: int, requests: int, warmup: int, seed: int) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    issued = 0
+
+    async def worker(index: int, budget: int, record: bool) -> None:
+        nonlocal issued
+        rng = random.Random(seed * 1000 + index)
+        while issued < budget:
+            issued += 1
+            kwargs = build(rng, index)
+            start = time.perf_counter()
+            try:
+                response = await client.request(**kwargs)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            if record:
+                latencies.append((time.perf_counter() - start) * 1e3)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(worker(i, warmup, False) for i in range(concurrency)))
+    issued = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i, requests, True) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "errors": len(latencies) - ok,
+        "statuses": statuses,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions: p95/p99 more than `threshold` slower, or throughput more than `threshold` lower."""
+    regressions = []
+    print(f"\n{'scenario':<16} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for metric, higher_is_worse in (("p95_ms", True), ("p99_ms", True), ("throughput_rps", False)):
+            old, new = base[metric], current[metric]
+            change = (new - old) / old if old else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            flag = "  REGRESSION" if worse else ""
+            print(f"{name:<16} {metric:<15} {old:>10.2f} {new:>10.2f} {change:>+7.1%}{flag}")
+            if worse:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def _in_process_client(args):
+    import httpx
+
+    from backend.main import app
+    from backend.app.services.model_scheduler import model_scheduler
+    from backend.app.services.rag_service import rag_service
+    from backend.app.services.vision_service import vision_service
+    from backend.benchmarks.load.fake_gemini import install
+
+    install(vision_service, rag_service, seed=args.seed, base_ms=args.fake_latency_ms,
+            jitter_ms=args.fake_jitter_ms, chat_llm=args.chat_llm)
+    # Simulated clients are few and fast; measure the service, not the per-client limiter
+    model_scheduler.client_rate = model_scheduler.client_burst = args.client_rate
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Load benchmark for the AarogyaMitra API")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated: " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--fake-latency-ms", type=float, default=300.0)
+    parser.add_argument("--fake-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--chat-llm", action="store_true", help="Route chat through a fake streaming LLM")
+    parser.add_argument("--client-rate", type=float, default=1e6, help="Per-client model rate (in-process only)")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="Compare against this saved report")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    if args.url:
+        import httpx
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        client = _in_process_client(args)
+
+    report = {
+        "meta": {
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+            "fake_latency_ms": None if args.url else args.fake_latency_ms,
+            "chat_llm": args.chat_llm,
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+    async with client:
+        for name in names:
+            result = await run_scenario(client, SCENARIOS[name], args.concurrency, args.requests,
+                                        args.warmup, args.seed)
+            report["scenarios"][name] = result
+            print(f"{name:<16} {result['throughput_rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}  "
+                  f"p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline: Optional[dict] = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nFAIL: " + "; ".join(regressions))
+            sys.exit(1)
+        print("\nOK: no regressions beyond the threshold")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+# Deterministic stand-in for google.generativeai models.
+# Latency is a fixed base plus a per-KB cost of the request payload, with
+# optional seeded jitter and seeded 429s, and the response text is derived
+# from a hash of the input - the same request always gets the same answer.
+
+import asyncio
+import hashlib
+import random
+from typing import Optional
+
+PHRASES = [
+    "Path is clear ahead.", "Chair two steps in front, veer left.", "A person is standing to your right.",
+    "Stairs descending ahead, slow down.", "Exit sign on the left wall.", "Door ahead, handle on the right.",
+]
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeRateLimit(Exception):
+    code = 429
+
+
+class FakeGenerativeModel:
+    def __init__(self, base_ms: float = 300.0, per_kb_ms: float = 0.5, jitter_ms: float = 0.0,
+                 rate_limit_ratio: float = 0.0, seed: int = 0):
+        self.base_ms = base_ms
+        self.per_kb_ms = per_kb_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def _digest(self, contents) -> bytes:
+        digest = hashlib.sha256()
+        for part in contents if isinstance(contents, list) else [contents]:
+            if isinstance(part, dict):
+                digest.update(part.get("data", b""))
+            else:
+                digest.update(str(part).encode("utf-8"))
+        return digest.digest()
+
+    def _size(self, contents) -> int:
+        parts = contents if isinstance(contents, list) else [contents]
+        return sum(len(p.get("data", b"")) if isinstance(p, dict) else len(str(p)) for p in parts)
+
+    async def generate_content_async(self, contents, **kwargs) -> FakeResponse:
+        self.calls += 1
+        delay = self.base_ms + self.per_kb_ms * self._size(contents) / 1024
+        if self.jitter_ms:
+            delay += self._rng.uniform(0, self.jitter_ms)
+        await asyncio.sleep(delay / 1000)
+        if self.rate_limit_ratio and self._rng.random() < self.rate_limit_ratio:
+            raise FakeRateLimit("429 Resource has been exhausted")
+
+        digest = self._digest(contents)
+        if isinstance(contents, list):
+            return FakeResponse(" ".join(PHRASES[b % len(PHRASES)] for b in digest[:3]))
+        return FakeResponse(f"Simplified ({digest[:4].hex()}): " + str(contents)[-120:])
+
+
+def fake_text_generator(model: FakeGenerativeModel, chunks: int = 8):
+    """RAGService.text_generator hook backed by the fake model, streamed in `chunks` pieces."""
+    async def generate(messages, detected_lang):
+        response = await model.generate_content_async(messages[-1].get("content", ""))
+        text = response.text
+        step = max(1, len(text) // chunks)
+        for i in range(0, len(text), step):
+            yield text[i:i + step]
+
+    return generate
+
+
+def install(vision_service, rag_service=None, seed: int = 0, base_ms: float = 300.0,
+            jitter_ms: float = 0.0, rate_limit_ratio: float = 0.0,
+            chat_llm: bool = False) -> Optional[FakeGenerativeModel]:
+    """Replaces the Gemini models (and optionally the chat LLM hook) with seeded fakes."""
+    vision_service.model = FakeGenerativeModel(base_ms, jitter_ms=jitter_ms,
+                                               rate_limit_ratio=rate_limit_ratio, seed=seed)
+    vision_service.text_model = FakeGenerativeModel(base_ms, jitter_ms=jitter_ms,
+                                                    rate_limit_ratio=rate_limit_ratio, seed=seed + 1)
+    if chat_llm and rag_service is not None:
+        chat_model = FakeGenerativeModel(base_ms, jitter_ms=jitter_ms, seed=seed + 2)
+        rag_service.text_generator = fake_text_generator(chat_model)
+        return chat_model
+    return None
@@ -0,0 +1,100 @@
+# Request mixes for the load benchmark. Each scenario builds httpx request
+# kwargs from a seeded RNG, so two runs with the same seed send the same traffic.
+
+import io
+import random
+from typing import Callable, Dict, List
+
+CHAT_MESSAGES = {
+    "safety": [
+        "I want to die, I can't take this anymore",
+        "I have been thinking about ending my life",
+        "I took some pills and I feel dizzy",
+    ],
+    "psych": [
+        "I feel so anxious and lonely these days",
+        "I am really stressed and can't sleep",
+        "I feel sad all the time and nothing helps",
+    ],
+    "fever": [
+        "I have had a fever since yesterday",
+        "mujhe bukhar hai aur sir dard bhi",
+        "My temperature is 101 and I feel weak",
+    ],
+    "generic": [
+        "hello",
+        "what can you help me with?",
+        "namaste",
+    ],
+}
+
+LONG_MESSAGE = (
+    "I have been having headaches in the evening for two weeks, mostly behind the eyes. "
+    "I sit in front of a laptop for ten hours a day and I do not drink much water. "
+) * 12
+
+SIMPLIFY_TEXTS = [
+    "DISCHARGE SUMMARY: Patient admitted with acute febrile illness. Advised oral rehydration, "
+    "antipyretics as needed and review in OPD after 5 days.",
+    "CBC REPORT: Haemoglobin 10.9 g/dL (L). MCV 72 fL (L). Impression: microcytic hypochromic anaemia.",
+    "LIPID PROFILE: Total cholesterol 242 mg/dL (H), LDL 165 mg/dL (H), HDL 38 mg/dL (L).",
+]
+
+
+def _chat(kind: str) -> Callable[[random.Random, int], dict]:
+    def build(rng: random.Random, worker: int) -> dict:
+        if kind == "long":
+            history = [{"role": "user" if i % 2 == 0 else "assistant", "content": LONG_MESSAGE} for i in range(9)]
+            messages = history + [{"role": "user", "content": LONG_MESSAGE + rng.choice(CHAT_MESSAGES["fever"])}]
+        else:
+            messages = [{"role": "user", "content": rng.choice(CHAT_MESSAGES[kind])}]
+        return {"method": "POST", "url": "/api/v1/chat/", "json": {"messages": messages}}
+    return build
+
+
+def _frames(count: int = 16, seed: int = 0) -> List[bytes]:
+    """Camera-like 1280x960 JPEGs (~100-200 KB): a lit gradient scene with sensor noise."""
+    from PIL import Image
+
+    out = []
+    for i in range(count):
+        scene = Image.linear_gradient("L").resize((1280, 960)).rotate((seed + i) * 23 % 360)
+        noise = Image.effect_noise((1280, 960), 12 + (seed + i) % 20)
+        image = Image.merge("RGB", (scene, Image.blend(scene, noise, 0.3), noise))
+        buf = io.BytesIO()
+        image.save(buf, format="JPEG", quality=85)
+        out.append(buf.getvalue())
+    return out
+
+
+def _vision() -> Callable[[random.Random, int], dict]:
+    frames: List[bytes] = []
+
+    def build(rng: random.Random, worker: int) -> dict:
+        if not frames:
+            frames.extend(_frames())
+        return {
+            "method": "POST", "url": "/api/v1/vision/analyze",
+            "files": {"file": ("frame.jpg", rng.choice(frames), "image/jpeg")},
+            "headers": {"X-Client-Id": f"load-{worker}"},
+        }
+    return build
+
+
+def _simplify(rng: random.Random, worker: int) -> dict:
+    return {
+        "method": "POST", "url": "/api/v1/vision/simplify",
+        "data": {"text": rng.choice(SIMPLIFY_TEXTS)},
+        "headers": {"X-Client-Id": f"load-{worker}"},
+    }
+
+
+SCENARIOS: Dict[str, Callable[[random.Random, int], dict]] = {
+    "chat_safety": _chat("safety"),
+    "chat_psych": _chat("psych"),
+    "chat_fever": _chat("fever"),
+    "chat_generic": _chat("generic"),
+    "chat_long": _chat("long"),
+    "vision_analyze": _vision(),
+    "simplify": _simplify,
+}
@@ -0,0 +1,119 @@
+# Benchmark: cost of the instrumentation layer.
+# 1. raw cost of Histogram.observe / Timer / Counter.inc
+# 2. MetricsMiddleware around a trivial ASGI app vs the bare app
+# 3. rag_service.generate_response with the stage timers vs no-op timers
+# 4. full /api/v1/chat/ request latency, for scale
+# Run from the repository root: python -m backend.benchmarks.metrics_overhead
+
+import asyncio
+import time
+
+from backend.app.core.metrics import Counter, Histogram, DEFAULT_BUCKETS, MetricsMiddleware, HistogramFamily
+import backend.app.services.rag_service as rag_module
+from backend.benchmarks.asgi import call
+
+MESSAGES = [{"role": "user", "content": "I have had a fever and headache since yesterday"}]
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class _NullHistogram:
+    def time(self):
+        return _NullTimer()
+
+    def observe(self, value):
+        pass
+
+
+def _per_call_ns(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e9
+
+
+def primitives(repeat: int = 200000) -> None:
+    histogram = Histogram(DEFAULT_BUCKETS)
+    counter = Counter()
+
+    def timed():
+        with histogram.time():
+            pass
+
+    print(f"Histogram.observe   {_per_call_ns(lambda: histogram.observe(0.003), repeat):7.0f} ns")
+    print(f"Timer (with block)  {_per_call_ns(timed, repeat):7.0f} ns")
+    print(f"Counter.inc         {_per_call_ns(counter.inc, repeat):7.0f} ns")
+    print(f"baseline (no-op)    {_per_call_ns(lambda: None, repeat):7.0f} ns")
+
+
+async def _asgi_app(scope, receive, send):
+    scope["route"] = object()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def middleware(repeat: int = 20000) -> float:
+    wrapped = MetricsMiddleware(_asgi_app, HistogramFamily("bench_seconds", "bench", ("method", "route", "status")))
+    results = {}
+    for name, app in (("bare", _asgi_app), ("middleware", wrapped)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await call(app, "/api/v1/chat/", method="GET")
+        results[name] = (time.perf_counter() - start) / repeat * 1e6
+    overhead = results["middleware"] - results["bare"]
+    print(f"ASGI request: bare {results['bare']:.1f} us, with middleware {results['middleware']:.1f} us "
+          f"(+{overhead:.1f} us)")
+    return overhead
+
+
+async def stage_timers(repeat: int = 5000) -> float:
+    service = rag_module.rag_service
+    names = ("SAFETY_SECONDS", "DETECTION_SECONDS", "RESPONSE_SECONDS", "RETRIEVAL_SECONDS")
+    real = {name: getattr(rag_module, name) for name in names}
+    results = {}
+    for label, timers in (("no-op timers", {n: _NullHistogram() for n in names}), ("stage timers", real)):
+        for name, timer in timers.items():
+            setattr(rag_module, name, timer)
+        await service.generate_response(MESSAGES)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await service.generate_response(MESSAGES)
+        results[label] = (time.perf_counter() - start) / repeat * 1e6
+    for name, timer in real.items():
+        setattr(rag_module, name, timer)
+    overhead = results["stage timers"] - results["no-op timers"]
+    print(f"generate_response: {results['no-op timers']:.1f} us without, {results['stage timers']:.1f} us with "
+          f"stage timers (+{overhead:.1f} us)")
+    return overhead
+
+
+async def chat_request(repeat: int = 500) -> float:
+    from backend.main import app
+
+    await call(app, "/api/v1/chat/", {"messages": MESSAGES})
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call(app, "/api/v1/chat/", {"messages": MESSAGES})
+    per_request = (time.perf_counter() - start) / repeat * 1e6
+    print(f"/api/v1/chat/ end to end: {per_request:.1f} us per request")
+    return per_request
+
+
+async def main() -> None:
+    primitives()
+    print()
+    middleware_us = await middleware()
+    timers_us = await stage_timers()
+    request_us = await chat_request()
+    total = middleware_us + timers_us
+    print(f"\nInstrumentation: ~{total:.1f} us per chat request ({total / request_us * 100:.2f}% of request time)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
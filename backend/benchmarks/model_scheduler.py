@@ -0,0 +1,107 @@
+# Load test: ModelScheduler against a fake model server that injects latency
+# and answers 429 when more than `capacity` calls are in flight.
+# Traffic: one client streaming navigation frames as fast as it can, a crowd
+# of normal chat/simplify clients, and a few crisis-flagged requests.
+# Run from the repository root: python -m backend.benchmarks.model_scheduler
+
+import asyncio
+import random
+import time
+
+from backend.app.services.model_scheduler import ModelScheduler, Priority
+
+
+class RateLimitError(Exception):
+    code = 429
+
+
+class FakeModelServer:
+    def __init__(self, capacity: int = 6, latency: float = 0.08, jitter: float = 0.04, seed: int = 5):
+        self.capacity = capacity
+        self.latency = latency
+        self.jitter = jitter
+        self.active = 0
+        self.calls = 0
+        self.rejected = 0
+        self.rng = random.Random(seed)
+
+    async def generate(self):
+        self.calls += 1
+        if self.active >= self.capacity:
+            self.rejected += 1
+            await asyncio.sleep(0.005)
+            raise RateLimitError("429 Resource has been exhausted")
+        self.active += 1
+        try:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+            return "ok"
+        finally:
+            self.active -= 1
+
+
+async def traffic(call, duration: float = 5.0):
+    """call(client_id, priority) -> awaitable; returns per-class (ok, failed, latencies)."""
+    results = {p: {"ok": 0, "failed": 0, "latency": []} for p in Priority}
+    rng = random.Random(9)
+    stop = time.monotonic() + duration
+    tasks = []
+
+    async def one(client_id, priority):
+        start = time.monotonic()
+        try:
+            await call(client_id, priority)
+            results[priority]["ok"] += 1
+            results[priority]["latency"].append(time.monotonic() - start)
+        except Exception:
+            results[priority]["failed"] += 1
+
+    async def flood():
+        while time.monotonic() < stop:
+            tasks.append(asyncio.create_task(one("frame-streamer", Priority.REALTIME)))
+            await asyncio.sleep(1 / 60)
+
+    async def crowd(n):
+        while time.monotonic() < stop:
+            await asyncio.sleep(rng.expovariate(1.0))
+            tasks.append(asyncio.create_task(one(f"user-{n}", Priority.STANDARD)))
+
+    async def crisis():
+        while time.monotonic() < stop:
+            await asyncio.sleep(rng.expovariate(2.0))
+            tasks.append(asyncio.create_task(one(f"crisis-{rng.randrange(1000)}", Priority.CRISIS)))
+
+    await asyncio.gather(flood(), crisis(), *[crowd(n) for n in range(20)])
+    await asyncio.gather(*tasks)
+    return results
+
+
+def report(label, results, server, scheduler=None):
+    print(f"\n{label}: upstream calls={server.calls} upstream 429s={server.rejected}")
+    for priority, r in results.items():
+        lat = sorted(r["latency"])
+        p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1e3 if lat else float("nan")
+        print(f"  {priority.name:>8}: ok={r['ok']:>4} failed={r['failed']:>4} "
+              f"p50={p(0.5):7.1f} ms p95={p(0.95):7.1f} ms p99={p(0.99):7.1f} ms")
+    if scheduler:
+        snap = scheduler.snapshot()
+        print(f"  scheduler counters: granted={snap['granted']} shed={snap['shed']} "
+              f"retries={snap['retries']} rate_limited={snap['rate_limited']}")
+        for name, waits in snap["queue_wait"].items():
+            print(f"  queue wait {name:>8}: {waits}")
+
+
+async def main() -> None:
+    server = FakeModelServer()
+    results = await traffic(lambda client_id, priority: server.generate())
+    report("unscheduled (direct calls)", results, server)
+
+    server = FakeModelServer()
+    scheduler = ModelScheduler(max_concurrency=6, client_rate=4.0, client_burst=4.0,
+                               max_retries=3, backoff_base=0.05, queue_timeout=2.0)
+    results = await traffic(lambda client_id, priority: scheduler.run(server.generate, client_id=client_id,
+                                                                       priority=priority))
+    report("scheduled", results, server, scheduler)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
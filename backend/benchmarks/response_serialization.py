@@ -0,0 +1,83 @@
+# Benchmark: per-response CPU time and bytes on the wire for the longer
+# generate_response replies (mock mode). Compares the previous chat path
+# (ChatResponse built, re-validated through response_model and dumped), the
+# previous vision path (jsonable_encoder + JSONResponse), and FastJSONResponse,
+# then gzip / brotli as CompressionMiddleware applies them.
+# Run from the repository root: python -m backend.benchmarks.response_serialization
+
+import asyncio
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from backend.app.api.endpoints.chat import ChatResponse, router
+from backend.app.core.fast_response import ENCODINGS, CompressionMiddleware, FastJSONResponse
+from backend.app.services.rag_service import rag_service
+
+CASES = {
+    "exam_stress (en)": ("I am stressed about my exams", "en"),
+    "exam_stress (hi)": ("mujhe exam ka stress hai", "hi"),
+    "fever (en)": ("I have a fever since yesterday", "en"),
+    "fever (hi)": ("mujhe bukhar hai", "hi"),
+    "headache (en)": ("I have a headache", "en"),
+    "crisis (India)": ("i live in india and i want to die", "hi"),
+    "default (mr)": ("namaskar", "mr"),
+}
+CHAT_FIELD = next(route.response_field for route in router.routes if route.path == "/")
+
+
+async def replies() -> dict:
+    out = {}
+    for name, (message, language) in CASES.items():
+        result = await rag_service.generate_response([{"role": "user", "content": message}], language)
+        out[name] = {
+            "response": result["response"],
+            "sources": result["sources"],
+            "image_url": result["image_url"],
+            "alert": result.get("alert", False),
+            "session_id": "3f2b6c1e9a0d4e7f8b5a2c6d1e0f9a8b",
+        }
+    return out
+
+
+async def pydantic_path(content: dict) -> bytes:
+    model = ChatResponse(**content)
+    return await serialize_response(field=CHAT_FIELD, response_content=model, dump_json=True)
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def timed_async(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def main(repeat: int = 20_000) -> None:
+    middleware = CompressionMiddleware(None)
+    print(f"encodings available: {', '.join(ENCODINGS)}")
+    print(f"{'response':>17} {'pydantic_us':>11} {'encoder_us':>10} {'orjson_us':>9} "
+          f"{'json_B':>6} " + " ".join(f"{e + '_B':>6} {e + '_us':>6}" for e in ENCODINGS))
+    for name, content in (await replies()).items():
+        body = FastJSONResponse(content).body
+        assert body == await pydantic_path(content)
+        before = await timed_async(lambda: pydantic_path(content), repeat)
+        encoder = timed(lambda: JSONResponse(jsonable_encoder(content)), repeat)
+        fast = timed(lambda: FastJSONResponse(content), repeat)
+        row = f"{name:>17} {before:>11.2f} {encoder:>10.2f} {fast:>9.2f} {len(body):>6}"
+        for encoding in ENCODINGS:
+            compressed = middleware.compress(body, encoding)
+            row += f" {len(compressed):>6} {timed(lambda: middleware.compress(body, encoding), repeat // 10):>6.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
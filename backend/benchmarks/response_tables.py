@@ -0,0 +1,68 @@
+# Benchmark: crisis and canned chat responses rendered per request (the old
+# helpline concatenation loop and f-strings) vs prerendered ResponseTables
+# lookups, plus the cost of compiling the tables on a reload.
+# Run from the repository root: python -m backend.benchmarks.response_tables
+
+import json
+import random
+import time
+
+from backend.app.core.response_tables import DEFAULT_RESPONSES_PATH, DEFAULT_SAFETY_PATH, compile_tables
+
+with open(DEFAULT_SAFETY_PATH, encoding="utf-8") as f:
+    SAFETY = json.load(f)
+with open(DEFAULT_RESPONSES_PATH, encoding="utf-8") as f:
+    RESPONSES = json.load(f)
+
+
+def render_safety(template_id: str, language: str, text: str) -> str:
+    """The previous per-request crisis rendering."""
+    response_text = SAFETY["templates"][template_id]["text"]
+    helpline_text = "\n\nCRISIS RESOURCES:\n"
+    if language == "hi" or "india" in text:
+        for name, num in SAFETY["helplines"]["India"].items():
+            helpline_text += f"- {name}: {num}\n"
+    else:
+        for name, num in SAFETY["helplines"]["US"].items():
+            helpline_text += f"- {name}: {num}\n"
+    return response_text + helpline_text
+
+
+def render_fever(language: str) -> str:
+    """The previous per-request fever answer: random intro plus an f-string."""
+    intro_en = random.choice(RESPONSES["intros"]["en"])
+    intro_hi = RESPONSES["intros"]["hi"][0]
+    body = RESPONSES["responses"]["fever"][language].split("\n\n", 1)[1]
+    return f"{intro_hi if language == 'hi' else intro_en}\n\n{body}"
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat: int = 200_000) -> None:
+    tables = compile_tables(SAFETY, RESPONSES)
+    message = "i live in india and i want to die"
+    cases = {
+        "crisis (T004, India)": (lambda: render_safety("T004", "en", message),
+                                 lambda: tables.safety_text("T004", "en", message)),
+        "fever (en)": (lambda: render_fever("en"),
+                       lambda: random.choice(tables.response_variants("fever", "en"))),
+    }
+    assert render_safety("T004", "en", message) == tables.safety_text("T004", "en", message)
+
+    print(f"{'response':>22} {'render_us':>10} {'lookup_us':>10} {'speedup':>8}")
+    for name, (render, lookup) in cases.items():
+        before, after = timed(render, repeat), timed(lookup, repeat)
+        print(f"{name:>22} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+    compile_ms = timed(lambda: compile_tables(SAFETY, RESPONSES), 200) / 1e3
+    print(f"\ncompile on reload: {compile_ms:.2f} ms for {len(tables.safety)} crisis and "
+          f"{sum(len(v) for v in tables.responses.values())} chat variants")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmark: recall@k, query latency and index size for the flat, fp16 and
+# ivfpq VectorStore modes, using the offline hashing embedder. ivfpq is shown
+# with its default 8-bit re-ranking and without it (ivfpq-raw); index_mb
+# includes the re-ranking vectors.
+# Run from the repository root: python -m backend.benchmarks.retrieval
+
+import random
+import time
+
+import faiss
+import numpy as np
+
+from backend.app.services.embeddings import HashingEmbedder
+from backend.app.services.vector_store import VectorStore, INDEX_MODES
+
+VOCAB = (
+    "fever headache cough cold dengue malaria typhoid dehydration fluids rest paracetamol "
+    "temperature infection doctor hospital child adult pregnancy diet sleep stress anxiety "
+    "breathing exercise blood pressure sugar diabetes insulin vaccine dose tablet hygiene "
+    "water mosquito rash vomiting diarrhoea ors zinc nutrition iron anaemia protein"
+).split()
+
+
+def synthetic_corpus(size: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        {"text": " ".join(rng.choice(VOCAB) for _ in range(rng.randint(20, 60))), "source": f"doc-{i // 20}"}
+        for i in range(size)
+    ]
+
+
+def perturbed_queries(corpus, count: int, seed: int = 13):
+    rng = random.Random(seed)
+    queries = []
+    for passage in rng.sample(corpus, count):
+        words = passage["text"].split()
+        start = rng.randrange(max(1, len(words) - 8))
+        queries.append(" ".join(words[start:start + 8]))
+    return queries
+
+
+def main(corpus_size: int = 20000, query_count: int = 200, k: int = 5) -> None:
+    embedder = HashingEmbedder()
+    corpus = synthetic_corpus(corpus_size)
+    vectors = embedder.encode([p["text"] for p in corpus])
+    query_vectors = embedder.encode(perturbed_queries(corpus, query_count))
+
+    truth = None
+    print(f"{'mode':>9} {'recall@' + str(k):>9} {'p50_ms':>7} {'p95_ms':>7} {'index_mb':>9}")
+    for label in INDEX_MODES + ("ivfpq-raw",):
+        mode = "ivfpq" if label == "ivfpq-raw" else label
+        store = VectorStore(embedder, mode=mode, refine_factor=0 if label == "ivfpq-raw" else 10)
+        store.add(corpus, vectors)
+
+        latencies = []
+        found = []
+        for row in range(query_count):
+            start = time.perf_counter()
+            hits = store.search_vectors(query_vectors[row:row + 1], k)[0]
+            latencies.append((time.perf_counter() - start) * 1e3)
+            found.append({hit["id"] for hit in hits})
+
+        if truth is None:
+            truth = found  # flat is exact and runs first
+        recall = sum(len(f & t) for f, t in zip(found, truth)) / (k * query_count)
+        size_mb = sum(faiss.serialize_index(index).nbytes
+                      for index in (store.index, store.refine) if index is not None) / 1e6
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{label:>9} {recall:>9.3f} {p50:>7.3f} {p95:>7.3f} {size_mb:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
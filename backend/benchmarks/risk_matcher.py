@@ -0,0 +1,101 @@
+# Microbenchmark: compiled risk matcher vs the old per-keyword substring scans.
+# Also checks that disclosures the substring scan escalated still escalate with
+# whole-word matching, and exits non-zero if one does not.
+# Run from the repository root: python -m backend.benchmarks.risk_matcher
+
+import random
+import string
+import sys
+import time
+
+from backend.app.core.keyword_matcher import KeywordMatcher
+from backend.app.core.safety_data import RISK_KEYWORDS
+from backend.app.services.rag_service import rag_service
+
+MESSAGE = (
+    "I have been feeling really low since the exams started and I can't sleep. "
+    "My parents keep asking about results and I don't know what to tell them. "
+    "Yesterday I went on the highway to clear my head but it did not help at all."
+)
+
+# (message, expected level, expected template)
+ESCALATIONS = [
+    ("I burned myself again", "high", "T005"),
+    ("i keep cutting my arms", "high", "T005"),
+    ("there are cuts all over my legs", "high", "T005"),
+    ("I keep scratching my skin until it bleeds", "high", "T005"),
+    ("i was banging my head on the wall", "high", "T005"),
+    ("the hopelessness never goes away", "high", "T004"),
+    ("I am drowning in worthlessness", "high", "T004"),
+    ("i feel burdened", "high", "T004"),
+    ("i feel like i am burdensome to everyone", "high", "T004"),
+    ("i'm hopelessly lost", "high", "T004"),
+    ("I have been feeling suicidal", "high", "T004"),
+    ("i want to die", "high", "T004"),
+    ("I am going to kill myself now", "imminent", "T002"),
+    ("I got drunk last night", "moderate", "T006"),
+    # Whole-word matching must not fire inside other words
+    ("please execute the report", "none", None),
+    ("the scratchpad app crashed", "none", None),
+]
+
+
+def check_escalations() -> list:
+    failures = []
+    for message, level, template in ESCALATIONS:
+        result = rag_service._assess_risk(message)
+        if (result["level"], result["template"]) != (level, template):
+            failures.append(f"{message!r}: expected {level}/{template}, got {result['level']}/{result['template']}")
+    return failures
+
+
+def _synthetic_lexicon(size: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    lexicon = {category: list(words) for category, words in RISK_KEYWORDS.items()}
+    categories = list(lexicon)
+    for _ in range(size):
+        word_count = rng.randint(1, 3)
+        phrase = " ".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+            for _ in range(word_count)
+        )
+        lexicon[rng.choice(categories)].append(phrase)
+    return lexicon
+
+
+def _naive_scan(lexicon: dict, text: str) -> list:
+    text = text.lower()
+    return [category for category, words in lexicon.items() if any(k in text for k in words)]
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat: int = 2000) -> None:
+    print(f"{'keywords':>9} {'naive_us':>10} {'matcher_us':>11} {'build_ms':>9}")
+    for extra in (0, 100, 1000, 5000, 20000):
+        lexicon = _synthetic_lexicon(extra)
+        total = sum(len(words) for words in lexicon.values())
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(lexicon)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        naive_us = _time(lambda: _naive_scan(lexicon, MESSAGE), max(repeat // (1 + extra // 500), 20))
+        matcher_us = _time(lambda: matcher.find(MESSAGE), repeat)
+        print(f"{total:>9} {naive_us:>10.1f} {matcher_us:>11.1f} {build_ms:>9.1f}")
+
+    failures = check_escalations()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(ESCALATIONS)} escalation checks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Benchmark: incremental RiskState vs re-scanning the whole history every turn,
+# plus checks of the multi-turn escalation scenarios the state is meant to catch
+# (and benign ones it must not). Exits non-zero if a scenario fails.
+# Run from the repository root: python -m backend.benchmarks.risk_state
+
+import random
+import sys
+import time
+
+from backend.app.services.rag_service import RISK_MATCHER
+from backend.app.services.risk_state import RiskState
+
+FILLER = [
+    "I have had a headache since the morning and the tablets are not helping.",
+    "Exams are next week and I keep worrying about my marks.",
+    "My mother asked me to eat but I was not hungry today.",
+    "I went for a walk near the highway to clear my head.",
+    "Sleep has been bad, maybe four hours a night this week.",
+    "I feel hopeless about everything lately.",
+    "I drank a bit more alcohol than usual last night.",
+]
+
+# Per scenario: (user message, expected "level/template" after it)
+SCENARIOS = {
+    "plan then means": [
+        ("I feel hopeless and I want to die", "high/T004"),
+        ("I have been planning it for a while", "imminent/T001"),
+        ("my exams are next week", "none/-"),
+        ("there are sleeping pills in the cupboard", "imminent/T007"),
+    ],
+    "means then plan": [
+        ("nothing matters, I am worthless", "high/T004"),
+        ("dad keeps a rope in the shed", "none/-"),
+        ("I have planned it for tonight", "imminent/T007"),
+    ],
+    "plan in the ideation message": [
+        ("I want to die and I have a plan", "imminent/T001"),
+    ],
+    "repeated ideation": [
+        ("I feel hopeless", "high/T004"),
+        ("I want to die", "high/T004"),
+        ("I am worthless", "high/T003"),
+    ],
+    "study plan after ideation": [
+        ("I feel hopeless", "high/T004"),
+        ("made a study plan for exams", "none/-"),
+        ("the tablets are not helping my headache", "none/-"),
+    ],
+    "high fever after ideation": [
+        ("exams are making me feel hopeless", "high/T004"),
+        ("also i have a high fever since yesterday", "moderate/T006"),
+        ("I got drunk last night", "high/T006"),
+    ],
+    "plan without ideation": [
+        ("I need a study plan for my exams", "none/-"),
+        ("we keep a rope in the shed for camping", "none/-"),
+    ],
+    "ideation decaying to none": [
+        ("I feel hopeless", "high/T004"),
+        ("I drank alcohol at the party", "high/T006"),
+        ("the exam went okay", "none/-"),
+        ("had dinner with friends", "none/-"),
+        ("watched a movie", "none/-"),
+        ("slept early", "none/-"),
+        ("went for a walk", "none/-"),
+        ("I drank alcohol at the party", "moderate/T006"),
+    ],
+}
+
+
+def _rescan(history: list) -> dict:
+    # Old approach: rebuild the state from every user message so far
+    state = RiskState()
+    hits = {}
+    for message in history:
+        hits = RISK_MATCHER.find(message)
+        state.update(hits)
+    return state.assess(hits)
+
+
+def _conversation(turns: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(FILLER) for _ in range(turns)]
+
+
+def main(turns: int = 200) -> None:
+    history = _conversation(turns)
+
+    start = time.perf_counter()
+    state = RiskState()
+    for message in history:
+        hits = RISK_MATCHER.find(message)
+        state.update(hits)
+        state.assess(hits)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(1, len(history) + 1):
+        _rescan(history[:i])
+    rescan = time.perf_counter() - start
+
+    print(f"{turns}-turn conversation")
+    print(f"  incremental: {incremental * 1e3:8.2f} ms total, {incremental / turns * 1e6:7.1f} us/turn")
+    print(f"  re-scan:     {rescan * 1e3:8.2f} ms total, {rescan / turns * 1e6:7.1f} us/turn")
+    print()
+
+    failures = []
+    for name, turns in SCENARIOS.items():
+        state = RiskState()
+        results = []
+        for message, expected in turns:
+            hits = RISK_MATCHER.find(message)
+            state.update(hits)
+            risk = state.assess(hits)
+            result = f"{risk['level']}/{risk['template'] or '-'}"
+            results.append(result)
+            if result != expected:
+                failures.append(f"{name}: {message!r} expected {expected}, got {result}")
+        print(f"{name:<29} {' -> '.join(results)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {sum(len(turns) for turns in SCENARIOS.values())} scenario turns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# Benchmark: semantic response cache on paraphrase-heavy chat traffic, using the
+# offline hashing embedder and a fake LLM generator with fixed latency.
+# Reports hit rate, wrong-topic hits and latency saved for a few thresholds,
+# then checks near-duplicate hits, language separation, the crisis bypass,
+# mock mode, TTL expiry and eviction. Exits non-zero if a check fails.
+# Run from the repository root: python -m backend.benchmarks.semantic_cache
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from backend.app.core.config import get_settings
+
+PARAPHRASES = {
+    "fever": [
+        "I have a fever since yesterday", "i have had fever since yesterday", "fever since yesterday what to do",
+        "I have a high fever", "what should I do for fever", "my fever is not going down",
+    ],
+    "headache": [
+        "I have a headache", "I have a bad headache", "my head hurts a lot", "headache since morning",
+        "what to do for a headache", "severe headache what should I do",
+    ],
+    "exam_stress": [
+        "I am stressed about my exams", "exam stress is too much", "I feel anxious before exams",
+        "how to handle exam stress", "my exams are making me stressed", "exam tension help",
+    ],
+}
+UNIQUE = [
+    "how much water should I drink in summer", "is it safe to exercise after eating",
+    "what vaccines does a baby need", "can I take paracetamol with milk", "how long does a cold last",
+    "what foods are rich in iron", "is walking good for back pain", "how to sleep better at night",
+]
+# Phrasings the risk detector flags; those must never be answered from the cache
+CRISIS = ["I want to die", "I want to kill myself", "I have a plan to kill myself"]
+
+
+def traffic(count: int, seed: int = 21):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.75:
+            topic = rng.choice(list(PARAPHRASES))
+            out.append((rng.choice(PARAPHRASES[topic]), topic))
+        elif roll < 0.95:
+            query = rng.choice(UNIQUE) + f" (case {rng.randrange(1000)})"
+            out.append((query, query))
+        else:
+            out.append((rng.choice(CRISIS), "crisis"))
+    return out
+
+
+def service(threshold: float, latency: float):
+    os.environ.update({
+        "EMBEDDING_MODEL": "hashing",
+        "VECTOR_DB_PATH": "/nonexistent-benchmark-index",
+        "SEMANTIC_CACHE_THRESHOLD": str(threshold),
+        "SEMANTIC_CACHE_SIZE": "0" if threshold > 1 else "2048",
+    })
+    get_settings.cache_clear()
+    from backend.app.services.rag_service import RAGService
+
+    svc = RAGService()
+
+    async def generator(messages, detected_lang):
+        await asyncio.sleep(latency)
+        yield "ANSWER::" + messages[-1]["content"]
+
+    svc.text_generator = generator
+    return svc
+
+
+async def run(threshold: float, queries, topic_of, latency: float) -> dict:
+    svc = service(threshold, latency)
+    wrong = crisis_hits = 0
+    start = time.perf_counter()
+    for query, topic in queries:
+        before = svc.semantic_cache.stats["hits"] if svc.semantic_cache else 0
+        result = await svc.generate_response([{"role": "user", "content": query}])
+        hit = svc.semantic_cache is not None and svc.semantic_cache.stats["hits"] > before
+        if hit:
+            answered = topic_of.get(result["response"].split("ANSWER::", 1)[-1])
+            wrong += answered != topic
+            crisis_hits += topic == "crisis"
+    elapsed = time.perf_counter() - start
+    if svc.embedding_service is not None and svc.embedding_service._worker is not None:
+        svc.embedding_service._worker.cancel()
+    stats = svc.semantic_cache.snapshot() if svc.semantic_cache else {"hit_rate": 0.0, "saved_ms": 0.0}
+    return {"seconds": elapsed, "wrong": wrong, "crisis_hits": crisis_hits, **stats}
+
+
+async def main(count: int = 300, latency: float = 0.05) -> None:
+    queries = traffic(count)
+    topic_of = {query: topic for query, topic in queries}
+    print(f"{count} queries, fake LLM {latency * 1e3:.0f} ms; 75% paraphrases, 20% unique, 5% crisis")
+    print(f"{'threshold':>9} {'hit_rate':>8} {'wrong':>6} {'crisis':>6} {'total_s':>8} {'saved_s':>8}")
+    for threshold in (1.01, 0.95, 0.9, 0.8, 0.7, 0.6):
+        r = await run(threshold, queries, topic_of, latency)
+        label = "off" if threshold > 1 else f"{threshold:.2f}"
+        print(f"{label:>9} {r['hit_rate']:>8.3f} {r['wrong']:>6} {r['crisis_hits']:>6} "
+              f"{r['seconds']:>8.2f} {r['saved_ms'] / 1e3:>8.2f}")
+
+    svc = service(0.9, 0)
+    await svc.generate_response([{"role": "user", "content": "warm up"}])
+    cache = svc.semantic_cache
+    rng = np.random.default_rng(0)
+    for _ in range(cache.capacity):
+        vector = rng.standard_normal(cache.vectors.shape[1]).astype(np.float32)
+        cache.store("en", vector / np.linalg.norm(vector), {"response": "", "sources": []})
+    vector = await svc.embedding_service.embed("i have had fever since yesterday")
+    repeat = 2000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cache.lookup("en", vector)
+    svc.embedding_service._worker.cancel()
+    print(f"\nlookup: {(time.perf_counter() - start) / repeat * 1e6:.1f} us with {len(cache)} entries")
+
+    print("\nchecks:")
+    failures = await checks()
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+async def checks() -> list:
+    from backend.app.services.embeddings import HashingEmbedder
+    from backend.app.services.semantic_cache import SemanticCache
+
+    failures = []
+
+    def expect(name: str, ok: bool) -> None:
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    svc = service(0.95, 0)
+    fever = [{"role": "user", "content": "I have a fever since yesterday"}]
+    first = await svc.generate_response(fever)
+    again = await svc.generate_response([{"role": "user", "content": "i have a fever since yesterday!"}])
+    expect("near-duplicate hit", svc.semantic_cache.stats["hits"] == 1 and again["response"] == first["response"])
+    await svc.generate_response(fever, language="hi")
+    expect("other language misses", svc.semantic_cache.stats["hits"] == 1)
+    # Each crisis message twice: the repeat must not be answered from the cache either
+    answers = [(await svc.generate_response([{"role": "user", "content": message}]))["response"]
+               for message in CRISIS * 2]
+    expect("crisis bypasses the cache", svc.semantic_cache.stats["hits"] == 1
+           and not any("ANSWER::" in answer for answer in answers))
+    stores = svc.semantic_cache.stats["stores"]
+    svc.text_generator = None
+    await svc.generate_response([{"role": "user", "content": "how long does a cold last"}])
+    expect("mock mode skips the cache", svc.semantic_cache.stats["stores"] == stores)
+    svc.embedding_service._worker.cancel()
+
+    embedder = HashingEmbedder()
+    a, b, c = embedder.encode(["fever since yesterday", "headache since morning", "exam stress"])
+    cache = SemanticCache(embedder.dim, threshold=0.95, capacity=2, ttl_seconds=0.05)
+    cache.store("en", a, {"response": "a"})
+    await asyncio.sleep(0.1)
+    expect("expired entry misses", cache.lookup("en", a) is None)
+    cache.ttl = 3600
+    cache.store("en", a, {"response": "a"})
+    cache.store("en", b, {"response": "b"})
+    cache.lookup("en", a)
+    cache.store("en", c, {"response": "c"})
+    expect("least recently used is evicted", cache.lookup("en", b) is None
+           and (cache.lookup("en", a) or {}).get("response") == "a"
+           and (cache.lookup("en", c) or {}).get("response") == "c")
+    return failures
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+# Benchmark: /vision/simplify result cache with a stub model that counts calls.
+# Bursts of concurrent identical requests should cost one upstream call, and
+# a fresh VisionService pointed at the same SQLite file should not call at all.
+# Also checks that the SQLite tier stays within its row cap and TTL, and that
+# a failing disk write still returns the computed result.
+# Run from the repository root: python -m backend.benchmarks.simplify_cache
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from backend.app.core.config import get_settings
+from backend.app.services.result_cache import ResultCache
+from backend.app.services.vision_service import VisionService
+
+TEMPLATES = [
+    "DISCHARGE SUMMARY: Patient admitted with acute febrile illness. Advised oral rehydration, "
+    "antipyretics as needed and review in OPD after 5 days. Return immediately if bleeding or breathlessness.",
+    "CBC REPORT: Haemoglobin 10.9 g/dL (L). MCV 72 fL (L). Impression: microcytic hypochromic anaemia, "
+    "likely iron deficiency. Correlate clinically.",
+    "LIPID PROFILE: Total cholesterol 242 mg/dL (H), LDL 165 mg/dL (H), HDL 38 mg/dL (L). "
+    "Lifestyle modification advised.",
+]
+
+
+class CountingModel:
+    def __init__(self, latency: float = 0.2):
+        self.calls = 0
+        self.latency = latency
+
+    async def generate_content_async(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return type("Response", (), {"text": "Simplified: " + prompt[-40:]})()
+
+
+def service(disk_path: str) -> VisionService:
+    os.environ["SIMPLIFY_CACHE_PATH"] = disk_path
+    get_settings.cache_clear()
+    svc = VisionService()
+    # Both clients set, so the provider SDK is not imported mid-burst
+    svc.model = svc.text_model = CountingModel()
+    return svc
+
+
+async def main(requests_per_template: int = 50) -> None:
+    disk_path = os.path.join(tempfile.mkdtemp(), "simplify.sqlite")
+
+    svc = service(disk_path)
+    burst = [text for text in TEMPLATES for _ in range(requests_per_template)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*[svc.simplify_text(text) for text in burst])
+    elapsed = time.perf_counter() - start
+    assert all("simplified_text" in r for r in results)
+    print(f"burst of {len(burst)} requests over {len(TEMPLATES)} texts: "
+          f"{svc.text_model.calls} model calls in {elapsed * 1e3:.0f} ms")
+    print("  counters:", svc.simplify_cache.snapshot())
+
+    await asyncio.gather(*[svc.simplify_text(text) for text in burst])
+    print(f"repeat burst: {svc.text_model.calls} model calls total")
+    print("  counters:", svc.simplify_cache.snapshot())
+
+    restarted = service(disk_path)
+    await asyncio.gather(*[restarted.simplify_text(text) for text in TEMPLATES])
+    print(f"after restart (disk tier): {restarted.text_model.calls} model calls")
+    print("  counters:", restarted.simplify_cache.snapshot())
+
+    await disk_checks(os.path.join(os.path.dirname(disk_path), "capped.sqlite"))
+
+
+async def disk_checks(path: str) -> None:
+    async def compute():
+        return "value"
+
+    cache = ResultCache(max_entries=4, ttl_seconds=3600, disk_path=path, max_disk_rows=10)
+    cache._db.execute("INSERT INTO results VALUES ('stale', '\"old\"', 0)")
+    for i in range(25):
+        await cache.get_or_compute(f"text {i}", compute)
+    rows = cache._db.execute("SELECT COUNT(*), MIN(stored_at) FROM results").fetchone()
+    print(f"disk rows after 25 writes (cap 10, one expired row): {rows[0]}")
+    if rows[0] > 10 or rows[1] == 0:
+        print("FAIL: SQLite tier kept expired rows or exceeded max_disk_rows")
+        sys.exit(1)
+
+    cache._db.close()
+    try:
+        value = await cache.get_or_compute("written after the database closed", compute)
+    except sqlite3.Error as e:
+        print(f"FAIL: disk error reached the caller: {e}")
+        sys.exit(1)
+    print(f"with a failing disk tier the result is still returned: {value!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
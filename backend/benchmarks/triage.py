@@ -0,0 +1,48 @@
+# Benchmark: offline triage throughput (lines/s) over a synthetic JSONL
+# transcript export, for 1 to N worker processes. Conversations have 1-8 user
+# turns drawn from the load benchmark's chat messages, with ~5% crisis content.
+# Run from the repository root: python -m backend.benchmarks.triage [lines]
+
+import json
+import os
+import random
+import sys
+import tempfile
+
+from backend.app.services.triage import run
+from backend.benchmarks.load.scenarios import CHAT_MESSAGES, LONG_MESSAGE
+
+
+def write_transcripts(path: str, lines: int, seed: int = 13) -> None:
+    rng = random.Random(seed)
+    routine = CHAT_MESSAGES["psych"] + CHAT_MESSAGES["fever"] + CHAT_MESSAGES["generic"] + [LONG_MESSAGE[:600]]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            messages = []
+            for _ in range(rng.randint(1, 8)):
+                pool = CHAT_MESSAGES["safety"] if rng.random() < 0.05 else routine
+                messages.append({"role": "user", "content": rng.choice(pool)})
+                messages.append({"role": "assistant", "content": "..."})
+            f.write(json.dumps({"id": i, "messages": messages[:-1], "language": "en"}) + "\n")
+
+
+def main(lines: int = 100_000) -> None:
+    cpus = os.cpu_count() or 1
+    counts = sorted({w for w in (1, 2, 4, 8, 16, 32) if w <= max(cpus, 2)} | {cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transcripts.jsonl")
+        write_transcripts(path, lines)
+        print(f"{lines} conversations, {os.path.getsize(path) / 2**20:.1f} MB; {cpus} CPU(s)")
+        print(f"{'workers':>7} {'lines/s':>9} {'seconds':>8} {'speedup':>8}")
+        base = None
+        for workers in counts:
+            with open(path, encoding="utf-8") as source, open(os.devnull, "w") as sink:
+                stats = run(source, sink, workers=workers, progress_seconds=0)
+            base = base or stats["lines_per_second"]
+            print(f"{workers:>7} {stats['lines_per_second']:>9.0f} {stats['seconds']:>8.2f} "
+                  f"{stats['lines_per_second'] / base:>7.2f}x")
+        print("levels:", stats["levels"], "peak:", stats["peak_levels"])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
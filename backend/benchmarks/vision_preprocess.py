@@ -0,0 +1,101 @@
+# Benchmark: event-loop blocking time and model payload size for 12 MP uploads,
+# before (decode + encode on the loop) and after (chunked read + thread-pool
+# draft decode / downscale) the preprocessing stage. The model is faked and
+# pinned for both vision clients so no provider SDK is imported while measuring,
+# and one warm-up upload starts the preprocessing pool beforehand.
+# Run from the repository root: python -m backend.benchmarks.vision_preprocess
+
+import asyncio
+import io
+import time
+
+from PIL import Image
+from starlette.datastructures import UploadFile
+
+from backend.app.services.vision_service import vision_service
+
+
+def photo_12mp(seed: int = 0) -> bytes:
+    """4000x3000 JPEG with enough texture that it compresses like a phone photo."""
+    noise = Image.effect_noise((4000, 3000), 60 + seed)
+    gradient = Image.linear_gradient("L").resize((4000, 3000))
+    image = Image.merge("RGB", (noise, gradient, noise.transpose(Image.FLIP_LEFT_RIGHT)))
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=92)
+    return out.getvalue()
+
+
+class FakeModel:
+    def __init__(self):
+        self.payload_bytes = []
+
+    async def generate_content_async(self, parts):
+        image = parts[1]
+        if isinstance(image, dict):
+            data = image["data"]
+        else:
+            # What the SDK does with a PIL image: encode it on the calling thread
+            buf = io.BytesIO()
+            image.save(buf, format="JPEG")
+            data = buf.getvalue()
+        self.payload_bytes.append(len(data))
+        await asyncio.sleep(0.05)
+        return type("Response", (), {"text": "Path is clear."})()
+
+
+async def legacy_analyze(model: FakeModel, file: UploadFile) -> None:
+    """The analyze_image body before preprocessing was added."""
+    contents = await file.read()
+    image = Image.open(io.BytesIO(contents))
+    await model.generate_content_async(["prompt", image])
+
+
+async def measure(run) -> float:
+    """Runs `run` while a 1 ms ticker records the worst event-loop stall."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, (time.perf_counter() - before - 0.001) * 1e3)
+
+    tick = asyncio.create_task(ticker())
+    await run()
+    done = True
+    await tick
+    return worst
+
+
+async def main(frames: int = 3) -> None:
+    uploads = [photo_12mp(i) for i in range(frames)]
+    print(f"upload size: {sum(map(len, uploads)) / frames / 1e6:.2f} MB avg, 4000x3000")
+
+    legacy = FakeModel()
+    legacy_stall = []
+    for data in uploads:
+        legacy_stall.append(await measure(lambda: legacy_analyze(legacy, UploadFile(io.BytesIO(data)))))
+
+    fake = FakeModel()
+    vision_service.configured = True
+    vision_service.model = vision_service.text_model = fake
+    await vision_service.analyze_image(UploadFile(io.BytesIO(uploads[0])))
+    fake.payload_bytes.clear()
+    stall = []
+    timings = []
+    for data in uploads:
+        async def run():
+            result = await vision_service.analyze_image(UploadFile(io.BytesIO(data)))
+            timings.append(result["timings"])
+        stall.append(await measure(run))
+
+    print(f"{'path':>8} {'max_loop_stall_ms':>18} {'payload_kb':>11}")
+    print(f"{'before':>8} {max(legacy_stall):>18.1f} {sum(legacy.payload_bytes) / frames / 1e3:>11.1f}")
+    print(f"{'after':>8} {max(stall):>18.1f} {sum(fake.payload_bytes) / frames / 1e3:>11.1f}")
+    print("per-stage timings (after):", timings[-1])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
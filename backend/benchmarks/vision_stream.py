@@ -0,0 +1,143 @@
+# Load test: WebSocket continuous-vision pump (FrameStream) vs processing every
+# frame in arrival order, with a fake model of configurable latency.
+# Frames are produced at a fixed rate faster than the model can answer. The
+# fake model is pinned for both vision_service clients so no provider SDK is
+# imported during the run, and the last frames are drained before the stream
+# closes so they count as completed rather than cancelled.
+# Run from the repository root:
+#   python -m backend.benchmarks.vision_stream [--fps 30] [--latency-ms 250] [--seconds 6] [--inflight 1]
+
+import argparse
+import asyncio
+import io
+import statistics
+import time
+import tracemalloc
+
+from PIL import Image
+
+from backend.app.services.vision_service import vision_service
+from backend.app.services.vision_stream import FrameStream
+
+
+class SlowModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content_async(self, parts):
+        await asyncio.sleep(self.latency)
+        return type("Response", (), {"text": "Path is clear."})()
+
+
+def frames(count: int):
+    out = []
+    for i in range(count):
+        buf = io.BytesIO()
+        Image.effect_noise((640, 480), 30 + i % 50).convert("RGB").save(buf, format="JPEG", quality=80)
+        out.append(buf.getvalue())
+    return out
+
+
+async def produce(queue: asyncio.Queue, payloads, fps: float) -> None:
+    interval = 1.0 / fps
+    start = time.perf_counter()
+    for i, payload in enumerate(payloads):
+        await asyncio.sleep(max(0.0, start + i * interval - time.perf_counter()))
+        await queue.put((time.perf_counter(), payload))
+    await queue.put((time.perf_counter(), None))
+
+
+async def run_latest_wins(payloads, fps: float, inflight: int):
+    queue: asyncio.Queue = asyncio.Queue()
+    results = []
+
+    async def send(message):
+        results.append((time.perf_counter(), message["latency_ms"]))
+
+    busy = 0
+
+    async def analyze(data):
+        nonlocal busy
+        busy += 1
+        try:
+            return await vision_service.analyze_bytes(data)
+        finally:
+            busy -= 1
+
+    async def receive():
+        _, payload = await queue.get()
+        if payload is None:
+            # FrameStream.run cancels in-flight work once input ends; wait for it
+            while stream._pending is not None or busy:
+                await asyncio.sleep(0.005)
+        return payload
+
+    stream = FrameStream(analyze, send, max_inflight=inflight)
+    producer = asyncio.create_task(produce(queue, payloads, fps))
+    await stream.run(receive)
+    await producer
+    return results, stream.stats()
+
+
+async def run_in_order(payloads, fps: float):
+    """Baseline: every frame is analysed, oldest first, from an unbounded backlog."""
+    queue: asyncio.Queue = asyncio.Queue()
+    results = []
+    backlog_peak = 0
+    producer = asyncio.create_task(produce(queue, payloads, fps))
+    while True:
+        backlog_peak = max(backlog_peak, queue.qsize())
+        received, payload = await queue.get()
+        if payload is None:
+            break
+        await vision_service.analyze_bytes(payload)
+        results.append((time.perf_counter(), (time.perf_counter() - received) * 1e3))
+    await producer
+    return results, {"received": len(payloads), "completed": len(results), "backlog_peak_frames": backlog_peak}
+
+
+def summarize(label, results, stats, peak_bytes):
+    gaps = [(b[0] - a[0]) * 1e3 for a, b in zip(results, results[1:])]
+    latencies = [latency for _, latency in results]
+    print(f"{label}: {stats}")
+    print(f"  peak traced memory (excluding pre-encoded frames): {peak_bytes / 1e6:.2f} MB")
+    if gaps:
+        print(f"  output cadence ms: p50={statistics.median(gaps):.1f} max={max(gaps):.1f}")
+    if latencies:
+        print(f"  frame latency ms: p50={statistics.median(latencies):.1f} max={max(latencies):.1f}")
+    else:
+        print("  frame latency ms: no frames completed")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--latency-ms", type=float, default=250)
+    parser.add_argument("--seconds", type=float, default=6)
+    parser.add_argument("--inflight", type=int, default=1)
+    args = parser.parse_args()
+
+    # Pin the fake model for the whole run, even when .env has GOOGLE_API_KEY
+    model = SlowModel(args.latency_ms / 1000)
+    vision_service.configured = True
+    vision_service.model = vision_service.text_model = model
+    payloads = frames(int(args.fps * args.seconds))
+    # Warm-up: first-use imports and allocations stay out of the measured runs
+    model.latency = 0
+    await vision_service.analyze_bytes(payloads[0])
+    model.latency = args.latency_ms / 1000
+    print(f"{len(payloads)} frames at {args.fps} fps, model latency {args.latency_ms} ms, in-flight {args.inflight}")
+
+    for label, runner in (
+        ("latest-frame-wins", lambda: run_latest_wins(payloads, args.fps, args.inflight)),
+        ("in-order baseline", lambda: run_in_order(payloads, args.fps)),
+    ):
+        tracemalloc.start()
+        results, stats = await runner()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        summarize(label, results, stats, peak)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
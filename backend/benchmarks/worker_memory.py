@@ -0,0 +1,130 @@
+# Benchmark: per-worker memory with the vector index loaded privately vs
+# memory-mapped (VECTOR_INDEX_MMAP), for 1 and 4 worker processes.
+# Each worker does what a uvicorn worker does at startup (imports backend.main,
+# warms up the RAG service) and then runs a few hybrid retrievals so every page
+# of the index has been touched. Memory is read from /proc/<pid>/smaps_rollup
+# while all workers are alive: "private" is what each extra worker costs, PSS
+# sums to the host total with shared pages split between the workers. With a
+# single worker the mapped index counts as private too: nothing else maps it.
+# Exits non-zero unless, with 4 workers, mmap at least halves the private
+# memory per worker and cuts the host total (PSS) by 40%.
+# Linux only. Run from the repository root: python -m backend.benchmarks.worker_memory
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from backend.app.services.embeddings import HashingEmbedder
+from backend.app.services.vector_store import VectorStore
+from backend.benchmarks.hybrid_retrieval import corpus, queries
+
+
+def build_index(root: str, per_term: int) -> int:
+    embedder = HashingEmbedder()
+    passages, _ = corpus(per_term)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((len(passages), embedder.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    store = VectorStore(embedder, mode="flat")
+    store.add(passages, vectors)
+    store.publish(root)
+    return len(passages)
+
+
+def memory_mb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def worker(loaded, release) -> None:
+    import asyncio
+
+    from backend.main import app  # noqa: F401  (same imports as a uvicorn worker)
+    from backend.app.services.rag_service import rag_service
+
+    async def retrieve():
+        for query, _ in queries(20):
+            await rag_service._retrieve(query)
+        rag_service.embedding_service._worker.cancel()
+
+    started = time.perf_counter()
+    rag_service.warm_up()
+    load_s = time.perf_counter() - started
+    asyncio.run(retrieve())
+    loaded.put((os.getpid(), load_s, rag_service.status()["passages"]))
+    release.wait()
+
+
+def run(workers: int, mmap: bool) -> dict:
+    os.environ["VECTOR_INDEX_MMAP"] = str(mmap).lower()
+    ctx = multiprocessing.get_context("spawn")
+    loaded, release = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=worker, args=(loaded, release)) for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    reports = [loaded.get(timeout=600) for _ in procs]
+    # Measured while every worker is alive, so PSS splits shared pages between all of them
+    memory = [memory_mb(pid) for pid, _, _ in reports]
+    release.set()
+    for proc in procs:
+        proc.join()
+    return {
+        "load_s": max(load_s for _, load_s, _ in reports),
+        "passages": reports[0][2],
+        "rss": sum(m["rss"] for m in memory) / workers,
+        "private": sum(m["private"] for m in memory) / workers,
+        "pss_total": sum(m["pss"] for m in memory),
+    }
+
+
+def main(per_term: int = 3000) -> None:
+    root = tempfile.mkdtemp(prefix="aarogya-index-")
+    try:
+        count = build_index(root, per_term)
+        size_mb = sum(os.path.getsize(os.path.join(dirpath, name)) / 2**20
+                      for dirpath, _, names in os.walk(root) for name in names)
+        print(f"index: {count} passages, {size_mb:.0f} MB on disk")
+        os.environ.update({"VECTOR_DB_PATH": root, "EMBEDDING_MODEL": "hashing", "WARMUP_ON_STARTUP": "false"})
+
+        print(f"{'mode':>7} {'workers':>7} {'load_s':>7} {'rss/worker':>10} {'private/worker':>14} {'host_total(pss)':>15}")
+        results = {}
+        for mmap in (False, True):
+            for workers in (1, 4):
+                r = results[(mmap, workers)] = run(workers, mmap)
+                print(f"{'mmap' if mmap else 'private':>7} {workers:>7} {r['load_s']:>7.2f} {r['rss']:>8.0f}MB "
+                      f"{r['private']:>12.0f}MB {r['pss_total']:>13.0f}MB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    private, mapped = results[(False, 4)], results[(True, 4)]
+    failures = [f"{'mmap' if mmap else 'private'} x{workers}: {r['passages']} passages loaded, expected {count}"
+                for (mmap, workers), r in results.items() if r["passages"] != count]
+    if mapped["private"] > 0.5 * private["private"]:
+        failures.append(f"private memory per worker {mapped['private']:.0f} MB with mmap vs "
+                        f"{private['private']:.0f} MB without; expected at most half")
+    if mapped["pss_total"] > 0.6 * private["pss_total"]:
+        failures.append(f"host total {mapped['pss_total']:.0f} MB with mmap vs "
+                        f"{private['pss_total']:.0f} MB without; expected at most 60%")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
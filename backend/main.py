@@ -1,12 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from backend.app.api.router import api_router
+from backend.app.core.config import get_settings
+from backend.app.core.fast_response import CompressionMiddleware
+from backend.app.core.metrics import MetricsMiddleware, registry
+from backend.app.core.response_tables import response_tables
+from backend.app.services.model_scheduler import model_scheduler
+from backend.app.services.rag_service import rag_service
+from backend.app.services.vision_service import vision_service
+
+
+async def warm_up() -> None:
+    """Loads the heavy providers off the event loop so the first requests do not pay for it."""
+    await asyncio.gather(
+        asyncio.to_thread(vision_service.warm_up),
+        asyncio.to_thread(rag_service.warm_up),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    # Started in the background so /health answers while models load
+    app.state.warmup = asyncio.create_task(warm_up()) if settings.WARMUP_ON_STARTUP else None
+    # Picks up edited template data files without a restart
+    watcher = None
+    if settings.RESPONSE_TABLES_RELOAD_SECONDS > 0:
+        watcher = asyncio.create_task(response_tables.watch(settings.RESPONSE_TABLES_RELOAD_SECONDS))
+    yield
+    for task in (app.state.warmup, watcher):
+        if task is not None:
+            task.cancel()
+
 
 app = FastAPI(
     title="AarogyaMitra API",
     description="Backend for AarogyaMitra Health Assistant",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -23,8 +59,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Inside metrics, so the recorded latency includes compression
+settings = get_settings()
+if settings.COMPRESSION_MIN_BYTES > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Outermost, so the recorded latency includes CORS handling
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
+
+def _cache_events() -> dict:
+    # Caches keep their own counters; they are only read when /metrics is scraped
+    samples = {}
+    sources = {
+        "frame": vision_service.frame_cache.stats(),
+        "simplify": vision_service.simplify_cache.stats,
+        "embedding": rag_service.embedding_service.stats if rag_service.embedding_service else {},
+        "semantic": rag_service.semantic_cache.stats if rag_service.semantic_cache else {},
+    }
+    for cache, stats in sources.items():
+        for event in ("hits", "disk_hits", "misses", "coalesced", "evictions"):
+            if event in stats:
+                samples[(cache, event)] = stats[event]
+    return samples
+
+
+registry.register_collector(
+    "aarogya_cache_events", "counter", "Cache lookups by cache and outcome", ("cache", "event"), _cache_events)
+registry.register_collector(
+    "aarogya_semantic_cache_saved_seconds", "counter", "Generation time avoided by semantic cache hits", (),
+    lambda: {(): rag_service.semantic_cache.stats["saved_ms"] / 1e3} if rag_service.semantic_cache else {})
+registry.register_collector(
+    "aarogya_response_table_reloads", "counter", "Template data reloads by result", ("result",),
+    lambda: {(result,): value for result, value in response_tables.reloads.items()})
+registry.register_collector(
+    "aarogya_model_scheduler_events", "counter", "Outbound model call scheduling outcomes", ("event",),
+    lambda: {(event,): value for event, value in model_scheduler.counters.items()})
+registry.register_collector(
+    "aarogya_model_scheduler_slots", "gauge", "Model call slots in use and requests queued", ("state",),
+    lambda: {("active",): model_scheduler.snapshot()["active"], ("queued",): model_scheduler.snapshot()["queued"]})
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to AarogyaMitra API"}
@@ -32,3 +113,37 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness, separate from liveness (/health). With WARMUP_ON_STARTUP the
+    replica is not ready until warm-up finishes; otherwise providers load lazily
+    and it is ready immediately. Either way, reports what is loaded so far.
+    """
+    warmup = getattr(app.state, "warmup", None)
+    if warmup is None:
+        state = "lazy"
+    elif not warmup.done():
+        state = "warming_up"
+    elif warmup.cancelled() or warmup.exception() is not None:
+        state = "failed"
+    else:
+        state = "warm"
+
+    return JSONResponse(
+        status_code=503 if state in ("warming_up", "failed") else 200,
+        content={
+            "status": "ready" if state in ("lazy", "warm") else "not_ready",
+            "warmup": state,
+            "subsystems": {
+                "vision": vision_service.status(),
+                "rag": rag_service.status(),
+                "templates": dict(response_tables.current.version),
+            },
+        },
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")